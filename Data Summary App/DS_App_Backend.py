@@ -2,82 +2,94 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from data_profile import CSV_CHUNK_ROWS, DISTINCT_ERROR, profile_csv, profile_frame
 
 
-def display_data_info(df):
+def display_data_info(df, distinct_error=None):
+    # distinct_error: relative error of HyperLogLog "unique" counts (None counts exactly)
+    render_profile(profile_frame(df, distinct_error), df)
+
+
+def display_csv_info(file, chunk_size=CSV_CHUNK_ROWS, distinct_error=DISTINCT_ERROR):
+    # Profiles a CSV chunk by chunk, for files larger than memory
+    render_profile(profile_csv(file, chunk_size, distinct_error=distinct_error))
+
+
+def render_profile(profile, df=None):
+    # df, when the rows are in memory, is only used to show the sampled duplicate rows
     st.write("----")
     st.write("### View Sample Data")
-    st.write(df.head())
+    st.write(profile.head)
     st.write("----")
     st.write("### Data Characteristics")
-    st.write(f"- **Number of Rows**: {df.shape[0]}")
-    st.write(f"- **Number of Columns**: {df.shape[1]}")
-    st.write(f"- **Is duplicated**: {df.duplicated().sum()}")
-    st.write(f"- **Column Names**: {df.columns.tolist()}")
+    st.write(f"- **Number of Rows**: {profile.rows}")
+    st.write(f"- **Number of Columns**: {len(profile.columns)}")
+    st.write(f"- **Is duplicated**: {profile.duplicates}")
+    st.write(f"- **Column Names**: {list(profile.columns)}")
     st.write("----")
 
     # columns datatype
     st.write("### Data Types:")
-    datatype_df = pd.DataFrame(df.dtypes).reset_index()
-    datatype_df.rename(columns={'index': 'Column_name', 0: 'dtypes'}, inplace=True)
-    st.write(datatype_df)
+    st.write(profile.dtypes_frame())
     st.write("----")
 
     # Check of Null values
     st.write("### Check for nulls:")
-    isnull_df = pd.DataFrame(df.isnull().sum()).reset_index()
-    isnull_df.rename(columns={'index': 'Column_name', 0: 'Null count'}, inplace=True)
-    isnull_df['Null Perc'] = round((isnull_df['Null count'] * 100 / df.shape[0]),2)
-    st.write(isnull_df)
+    st.write(profile.nulls_frame())
     st.write("----")
 
     # Check for Completeness
     st.write("### Completeness(%):")
-    total_values = df.size
-    non_missing_values = df.count().sum()
-    completeness_rate = round((non_missing_values/total_values)* 100,2)
+    completeness_rate = round(profile.completeness, 2)
     st.write(f" Completeness Rate in Perc: {completeness_rate}")
     st.write("----")
 
     # Check of Memory Usage
     st.write("### Memory Usage:")
-    Memory_usage_df = pd.DataFrame(df.memory_usage()).reset_index()
-    Memory_usage_df.rename(columns={'index': 'Column_name', 0: 'Memory Usage'}, inplace=True)
-    st.write(Memory_usage_df)
+    st.write(profile.memory_frame())
     st.write("----")
 
     # Check for Duplicate Records
     st.write("### Check for duplicates records:")
-    st.write(df[df.duplicated()])
-    st.write(f"Number of Duplicate Records: {df.duplicated().sum()}")
-    total_rows = len(df)
-    rows_duplicated = df.duplicated().sum()
-    duplicate_perc = round((rows_duplicated/total_rows) * 100,2)
+    if profile.duplicates:
+        sample = profile.duplicate_sample
+        st.write(f"First {len(sample)} duplicate records (row numbers from 0):")
+        st.write(df.iloc[sample] if df is not None else pd.DataFrame({"Row": sample}))
+    st.write(f"Number of Duplicate Records: {profile.duplicates}")
+    duplicate_perc = round(profile.duplicate_percentage, 2)
     st.write(f"Duplicate_Percentage (%):  {duplicate_perc}")
     st.write("----")
 
     # Status for Numerical Features
     st.write("### Statistical Information for Continuous variables:")
-    st.write(df.describe(include=['float64','int64','int32']).round(0))
+    st.write(profile.describe_numeric().round(0))
     st.write("----")
 
     # Status for Categorical Features
     st.write("### Statistical Information for Categorical variables:")
-    st.write(df.describe(include='object').loc[['unique','count']])
+    st.write(profile.describe_categorical())
+    if profile.approximate_distinct:
+        st.write(f"Unique counts for {', '.join(profile.approximate_distinct)} are HyperLogLog estimates.")
     st.write("----")
 
     # Distribution plots
-    numerical_cols = df.select_dtypes(include='number').columns
+    numerical_cols = profile.numeric_columns
     st.write("### Distribution of Numerical Columns")
     len_cols = len(numerical_cols)
     ncols = 3
     nrows = (len_cols // ncols)+1 if len_cols >=2 else 0
-    figplotsize = (16, 4) if len(df[numerical_cols].columns) <= 10 else (20, 25)
+    figplotsize = (16, 4) if len(numerical_cols) <= 10 else (20, 25)
 
     fig1, axes = plt.subplots(nrows, ncols, figsize=figplotsize)
     axes = axes.flatten()
     for ax, col in zip(axes, numerical_cols):
-        sns.histplot(data=df, x=col, kde=True, ax=ax)
+        histogram = profile.columns[col].histogram
+        if histogram is not None:
+            ax.stairs(histogram.counts, histogram.edges, fill=True, alpha=0.75)
+            if histogram.kde is not None:
+                ax.plot(histogram.centers, histogram.kde)
+        ax.set_xlabel(col)
+        ax.set_ylabel("Count")
         ax.set_title(f"Distribution of {col}")
 
     for ax in axes[len(numerical_cols):]:
@@ -87,16 +99,20 @@ def display_data_info(df):
     st.write("----")
 
     # Distribution plots
-    categorical_cols = df.select_dtypes(include='object').columns
+    categorical_cols = profile.categorical_columns
     st.write("### Distribution of Categorical Columns")
     len_cols = len(categorical_cols)
     ncols = 3 if len_cols >= 2 else 2
     nrows = (len_cols // ncols) + 1 if len_cols >= 2 else 0
-    figplotsize = (16, 4) if len(df[categorical_cols].columns) <= 10 else (20, 20)
+    figplotsize = (16, 4) if len(categorical_cols) <= 10 else (20, 20)
     fig2, axes = plt.subplots(nrows, ncols, figsize=figplotsize)
     axes = axes.flatten()
     for ax, col in zip(axes, categorical_cols):
-        sns.histplot(data=df, x=col, kde=True, ax=ax)
+        top = profile.columns[col].categories.top
+        ax.bar(top.index.astype(str), top.to_numpy(), alpha=0.75)
+        ax.tick_params(axis="x", labelrotation=90)
+        ax.set_xlabel(col)
+        ax.set_ylabel("Count")
         ax.set_title(f"Distribution of {col}")
     for ax in axes[len(categorical_cols):]:
         ax.set_visible(False)
@@ -105,38 +121,35 @@ def display_data_info(df):
     st.write("----")
 
     # Correlation Matrix
-    figplotsize = (16, 4) if len(df.columns) <= 10 else (20, 20)
+    figplotsize = (16, 4) if len(profile.columns) <= 10 else (20, 20)
     fig3 = plt.figure(figsize=figplotsize)
-    df1 = df.select_dtypes(include='number')
     st.write("### Correlation Matrix")
-    cm = df1.corr()
-    sns.heatmap(data=cm, annot=True)
+    sns.heatmap(data=profile.corr, annot=True)
     plt.tight_layout()
     st.pyplot(fig3)
     st.write("----")
 
     # Covariance Matrix
-    figplotsize = (16, 4) if len(df.columns) <= 10 else (20, 20)
+    figplotsize = (16, 4) if len(profile.columns) <= 10 else (20, 20)
     fig3 = plt.figure(figsize=figplotsize)
-    df1 = df.select_dtypes(include='number')
     st.write("### Covariance Matrix")
-    cm = df1.cov()
-    sns.heatmap(data=cm, annot=True)
+    sns.heatmap(data=profile.cov, annot=True)
     plt.tight_layout()
     st.pyplot(fig3)
     st.write("----")
 
     # Outlier detection
-    numerical_cols = df.select_dtypes(include='number').columns
     st.write("### Box Plots for Outlier Detection")
     len_cols = len(numerical_cols)
     ncols = 3 if len_cols >= 2 else 2
     nrows = (len_cols // ncols) + 1 if len_cols >= 2 else 0
-    figplotsize = (16, 4) if len(df[numerical_cols].columns) <= 10 else (20, 20)
+    figplotsize = (16, 4) if len(numerical_cols) <= 10 else (20, 20)
     fig4, axes = plt.subplots(nrows, ncols, figsize=figplotsize)
     axes = axes.flatten()
     for ax, col in zip(axes, numerical_cols):
-        sns.boxplot(data=df, y=col, ax=ax)
+        box = profile.columns[col].box
+        if box is not None:
+            ax.bxp([box.bxp_stats(col)], showfliers=True)
         ax.set_title(f"{col}")
     for ax in axes[len(numerical_cols):]:
         ax.set_visible(False)
@@ -146,13 +159,9 @@ def display_data_info(df):
 
     # Skewness and Kurtosis
     st.write("### Skewness and Kurtosis for Numerical Columns")
-    skew_kurt_df = pd.DataFrame({
-        "Skewness": df[numerical_cols].skew(),
-        "Kurtosis": df[numerical_cols].kurt()
-    }).reset_index().rename(columns={"index": "Column"})
-    st.write(skew_kurt_df)
+    st.write(profile.skew_kurt_frame())
 
     st.write("### Missing Data Heatmap")
     fig, ax = plt.subplots(figsize=(12, 6))
-    sns.heatmap(df.isnull(), cbar=False, cmap="viridis", ax=ax)
+    sns.heatmap(profile.null_map_frame(), cbar=False, cmap="viridis", ax=ax)
     st.pyplot(fig)
\ No newline at end of file
@@ -3,7 +3,7 @@ import pandas as pd
 # import matplotlib.pyplot as plt
 # import seaborn as sns
 # import DS_App_Backend
-from DS_App_Backend import display_data_info
+from DS_App_Backend import display_csv_info, display_data_info
 import io
 
 # Set up the Streamlit app title
@@ -16,15 +16,33 @@ option = st.selectbox("Option to choose data source", ["Upload a File", "Connect
 if option == "Upload a File":
     uploaded_file = st.file_uploader(" ", type=["csv", "xlsx"])
     if uploaded_file is not None:
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
+        # CSVs are profiled chunk by chunk, so the data never has to fit in
+        # memory as a DataFrame; Excel files are read whole
+        is_csv = uploaded_file.name.endswith('.csv')
+        if is_csv:
             st.write('#### You Uploaded CSV file')
         elif uploaded_file.name.endswith('.xlsx'):
             df = pd.read_excel(uploaded_file)
             st.write('#### You Uploaded file Excel file')
 
+        row1 = st.columns(3)
+        with row1[0]:
+            approximate_distinct = st.checkbox("Approximate Distinct Counts (HyperLogLog)", value=is_csv,
+                                               help="Exact counts keep every distinct value in memory")
+        with row1[1]:
+            distinct_error = st.number_input("Distinct Count Error (%)", min_value=0.1, max_value=10.0, value=1.0,
+                                             disabled=not approximate_distinct)
+        with row1[2]:
+            chunk_size = st.number_input("Rows per Chunk", min_value=1000, value=100_000, step=10_000,
+                                         disabled=not is_csv)
+
         if st.button("Click to view data insights"):
-            display_data_info(df)
+            distinct_error = distinct_error / 100 if approximate_distinct else None
+            if is_csv:
+                uploaded_file.seek(0)
+                display_csv_info(uploaded_file, int(chunk_size), distinct_error)
+            else:
+                display_data_info(df, distinct_error)
 
 # choose option2 (sql)
 elif option == "Connect to Database":
@@ -0,0 +1,612 @@
+import numpy as np
+import pandas as pd
+from duplicates import DUPLICATE_MEMORY_ROWS, DuplicateAccumulator
+from sketches import QUANTILE_K, HyperLogLog, KLLSketch
+
+# Computes everything the Data Summary report shows in one pass: rows are
+# folded into mergeable accumulators a block at a time, so a frame in memory
+# and a CSV read in chunks (profile_csv) go through the same code and give the
+# same numbers. Quartiles, whiskers, outlier counts and histograms come from
+# KLL quantile sketches: exact up to QUANTILE_K values per column, within
+# about 0.05% in rank beyond. Duplicate rows are counted from one 64-bit hash
+# per row (see duplicates.py). display_data_info only renders the DataProfile.
+
+HEAD_ROWS = 5
+NUMERIC_DTYPES = "number"
+CATEGORICAL_DTYPES = ["object", "string", "category"]
+# Box plot whiskers reach the furthest value within WHISKER * IQR of the box
+WHISKER = 1.5
+# Outliers drawn per box plot
+MAX_FLIERS = 500
+HISTOGRAM_MAX_BINS = 200
+# Bars per categorical distribution plot (the most frequent values)
+TOP_CATEGORIES = 30
+# The missing-data heatmap shows the null share of at most 2 * NULL_MAP_ROWS runs of rows
+NULL_MAP_ROWS = 500
+# Rows folded into the accumulators at a time
+BLOCK_ROWS = 1_000_000
+# Rows per chunk read from a CSV by profile_csv
+CSV_CHUNK_ROWS = 100_000
+# Relative standard error of the HyperLogLog distinct counts when profiling
+# in chunks (None counts exactly, with memory growing with the distinct values)
+DISTINCT_ERROR = 0.01
+# Values whose counts are tracked per categorical column when distinct counts
+# are approximate; the least frequent are dropped beyond this
+TRACKED_CATEGORIES = 10_000
+
+
+# ==============================
+# Profile Objects
+# ==============================
+class NumericSummary:
+    # describe() statistics plus skewness and (excess) kurtosis, all matching pandas
+    __slots__ = ("count", "mean", "std", "min", "q1", "median", "q3", "max", "skew", "kurt")
+
+    def __init__(self, count, mean, std, min, q1, median, q3, max, skew, kurt):
+        self.count = count
+        self.mean = mean
+        self.std = std
+        self.min = min
+        self.q1 = q1
+        self.median = median
+        self.q3 = q3
+        self.max = max
+        self.skew = skew
+        self.kurt = kurt
+
+
+class BoxSummary:
+    # Five-number summary with Tukey whiskers, in the form Axes.bxp draws
+    __slots__ = ("q1", "median", "q3", "whislo", "whishi", "outliers", "fliers")
+
+    def __init__(self, q1, median, q3, whislo, whishi, outliers, fliers):
+        self.q1 = q1
+        self.median = median
+        self.q3 = q3
+        self.whislo = whislo
+        self.whishi = whishi
+        self.outliers = outliers
+        self.fliers = fliers
+
+    def bxp_stats(self, label):
+        return {"label": label, "q1": self.q1, "med": self.median, "q3": self.q3,
+                "whislo": self.whislo, "whishi": self.whishi, "fliers": self.fliers}
+
+
+class Histogram:
+    # Bin counts and a Gaussian KDE (Scott's bandwidth) evaluated at the bin
+    # centers, scaled to counts like seaborn's histplot(kde=True)
+    __slots__ = ("counts", "edges", "kde")
+
+    def __init__(self, counts, edges, kde):
+        self.counts = counts
+        self.edges = edges
+        self.kde = kde
+
+    @property
+    def centers(self):
+        return (self.edges[:-1] + self.edges[1:]) / 2
+
+
+class CategorySummary:
+    # Distinct count (a HyperLogLog estimate unless exact) and the most frequent
+    # values with their counts
+    __slots__ = ("unique", "exact", "top")
+
+    def __init__(self, unique, exact, top):
+        self.unique = unique
+        self.exact = exact
+        self.top = top
+
+
+class ColumnProfile:
+    __slots__ = ("name", "dtype", "count", "nulls", "memory", "numeric", "box", "histogram", "categories")
+
+    def __init__(self, name, dtype, count, nulls, memory):
+        self.name = name
+        self.dtype = dtype
+        self.count = count
+        self.nulls = nulls
+        self.memory = memory
+        self.numeric = None
+        self.box = None
+        self.histogram = None
+        self.categories = None
+
+
+class DataProfile:
+    # duplicate_sample holds the row numbers (positions, from 0) of the first
+    # duplicate rows, at most DUPLICATE_SAMPLE_SIZE of them
+    __slots__ = ("rows", "columns", "head", "index_memory", "duplicates", "duplicate_sample", "corr", "cov",
+                 "null_map")
+
+    def __init__(self, rows, columns, head, index_memory, duplicates, duplicate_sample, corr, cov, null_map):
+        self.rows = rows
+        self.columns = columns
+        self.head = head
+        self.index_memory = index_memory
+        self.duplicates = duplicates
+        self.duplicate_sample = duplicate_sample
+        self.corr = corr
+        self.cov = cov
+        self.null_map = null_map
+
+    @property
+    def numeric_columns(self):
+        return [name for name, column in self.columns.items() if column.numeric is not None]
+
+    @property
+    def categorical_columns(self):
+        return [name for name, column in self.columns.items() if column.categories is not None]
+
+    @property
+    def approximate_distinct(self):
+        return [name for name in self.categorical_columns if not self.columns[name].categories.exact]
+
+    @property
+    def completeness(self):
+        size = self.rows * len(self.columns)
+        return sum(column.count for column in self.columns.values()) / size * 100 if size else np.nan
+
+    @property
+    def duplicate_percentage(self):
+        return self.duplicates / self.rows * 100 if self.rows else np.nan
+
+    def dtypes_frame(self):
+        return pd.DataFrame({"Column_name": list(self.columns),
+                             "dtypes": [column.dtype for column in self.columns.values()]})
+
+    def nulls_frame(self):
+        nulls = pd.DataFrame({"Column_name": list(self.columns),
+                              "Null count": [column.nulls for column in self.columns.values()]})
+        nulls["Null Perc"] = round(nulls["Null count"] * 100 / self.rows, 2)
+        return nulls
+
+    def memory_frame(self):
+        return pd.DataFrame({"Column_name": ["Index"] + list(self.columns),
+                             "Memory Usage": [self.index_memory] + [column.memory for column in self.columns.values()]})
+
+    def describe_numeric(self):
+        stats = ["count", "mean", "std", "min", "q1", "median", "q3", "max"]
+        return pd.DataFrame({name: [getattr(self.columns[name].numeric, stat) for stat in stats]
+                             for name in self.numeric_columns},
+                            index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"])
+
+    def describe_categorical(self):
+        return pd.DataFrame({name: [self.columns[name].categories.unique, self.columns[name].count]
+                             for name in self.categorical_columns}, index=["unique", "count"])
+
+    def skew_kurt_frame(self):
+        return pd.DataFrame({"Column": self.numeric_columns,
+                             "Skewness": [self.columns[name].numeric.skew for name in self.numeric_columns],
+                             "Kurtosis": [self.columns[name].numeric.kurt for name in self.numeric_columns]})
+
+    def null_map_frame(self):
+        return pd.DataFrame(self.null_map, columns=list(self.columns))
+
+
+# ==============================
+# Accumulators
+# ==============================
+# Each accumulator folds in one block of values with update() and combines
+# with another accumulator of the same kind (other chunks, other files) with
+# merge(), giving the same result as one pass over all the values (up to the
+# sketches' error).
+class MomentAccumulator:
+    # Count, mean and the central moment sums M2..M4, merged with the pairwise
+    # update of Chan et al. / Pebay (Welford's update for whole blocks), plus min and max
+    __slots__ = ("count", "mean", "m2", "m3", "m4", "min", "max")
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, m3=0.0, m4=0.0, min=np.inf, max=-np.inf):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.m3 = m3
+        self.m4 = m4
+        self.min = min
+        self.max = max
+
+    def update(self, valid):
+        if len(valid) == 0:
+            return
+        mean = valid.mean()
+        deviations = valid - mean
+        squares = deviations * deviations
+        self.merge(MomentAccumulator(len(valid), mean, squares.sum(), (squares * deviations).sum(),
+                                     (squares * squares).sum(), valid.min(), valid.max()))
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        self.m4 += other.m4 + delta * delta_n ** 3 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b) \
+            + 6 * delta_n ** 2 * (n_a * n_a * other.m2 + n_b * n_b * self.m2) \
+            + 4 * delta_n * (n_a * other.m3 - n_b * self.m3)
+        self.m3 += other.m3 + delta * delta_n ** 2 * n_a * n_b * (n_a - n_b) \
+            + 3 * delta_n * (n_a * other.m2 - n_b * self.m2)
+        self.m2 += other.m2 + delta * delta_n * n_a * n_b
+        self.mean += delta_n * n_b
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def summary(self, quartiles):
+        # skew and kurt use the same bias-corrected estimators as pandas (G1, G2)
+        n, m2, m3, m4 = self.count, self.m2, self.m3, self.m4
+        if n == 0:
+            return NumericSummary(0, *[np.nan] * 9)
+        std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+        skew = kurt = np.nan
+        if n > 2:
+            skew = 0.0 if m2 == 0 else np.sqrt(n * (n - 1)) / (n - 2) * (m3 / n) / (m2 / n) ** 1.5
+        if n > 3:
+            kurt = 0.0 if m2 == 0 else (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * (n * m4 / (m2 * m2) - 3) + 6)
+        return NumericSummary(n, self.mean, std, self.min, *quartiles, self.max, skew, kurt)
+
+
+class CoMomentAccumulator:
+    # Pairwise-complete co-moments, like DataFrame.corr()/cov(): entry [i, j]
+    # only counts the rows where columns i and j are both present. mean[i, j]
+    # and m2[i, j] are the mean and M2 of column i over those rows.
+    __slots__ = ("count", "mean", "m2", "comoment")
+
+    def __init__(self, k):
+        self.count = np.zeros((k, k))
+        self.mean = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+
+    def update(self, block):
+        # block is rows x columns, NaN for nulls. Sums are taken around each
+        # column's block mean, which keeps them small.
+        valid = ~np.isnan(block)
+        counts = valid.sum(axis=0)
+        shift = np.divide(np.where(valid, block, 0).sum(axis=0), counts, out=np.zeros(len(counts)),
+                          where=counts > 0)
+        shifted = np.where(valid, block - shift, 0)
+        valid = valid.astype("float64")
+        other = CoMomentAccumulator(0)
+        other.count = valid.T @ valid
+        sx = shifted.T @ valid
+        mean_shift = np.divide(sx, other.count, out=np.zeros_like(sx), where=other.count > 0)
+        other.mean = shift[:, None] + mean_shift
+        other.m2 = (shifted * shifted).T @ valid - sx * mean_shift
+        other.comoment = shifted.T @ shifted - sx * mean_shift.T
+        self.merge(other)
+
+    def merge(self, other):
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        weight = np.divide(self.count * other.count, count, out=np.zeros_like(count), where=count > 0)
+        self.m2 += other.m2 + delta * delta * weight
+        self.comoment += other.comoment + delta * delta.T * weight
+        self.mean += np.divide(delta * other.count, count, out=np.zeros_like(count), where=count > 0)
+        self.count = count
+
+    def corr_cov(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.clip(self.comoment / np.sqrt(self.m2 * self.m2.T), -1, 1)
+            cov = self.comoment / (self.count - 1)
+        corr[self.count < 2] = np.nan
+        cov[self.count < 2] = np.nan
+        return corr, cov
+
+
+class CategoryAccumulator:
+    # Value counts, merged lazily: block counts are combined once they add up
+    # to more entries than the merged counts. With distinct_error the distinct
+    # count comes from a HyperLogLog and only the TRACKED_CATEGORIES most
+    # frequent values keep their counts, so memory stays bounded.
+    __slots__ = ("counts", "pending", "pending_size", "distinct")
+
+    def __init__(self, distinct_error=None):
+        self.counts = pd.Series(dtype="int64")
+        self.pending = []
+        self.pending_size = 0
+        self.distinct = HyperLogLog(distinct_error) if distinct_error else None
+
+    def update(self, series):
+        if self.distinct is not None:
+            self.distinct.update(pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy())
+        self.add(series.value_counts(dropna=True))
+
+    def merge(self, other):
+        if self.distinct is not None:
+            self.distinct.merge(other.distinct)
+        self.add(other.value_counts())
+
+    def add(self, counts):
+        counts = counts[counts > 0]
+        self.pending.append(counts)
+        self.pending_size += len(counts)
+        if self.pending_size > max(len(self.counts), TOP_CATEGORIES):
+            self.value_counts()
+
+    def value_counts(self):
+        if self.pending:
+            counts = pd.concat([self.counts] + self.pending)
+            # Categorical blocks may come with different categories
+            counts.index = counts.index.astype(object)
+            self.counts = counts.groupby(level=0, sort=False).sum().sort_values(ascending=False)
+            if self.distinct is not None:
+                self.counts = self.counts.head(TRACKED_CATEGORIES)
+            self.pending = []
+            self.pending_size = 0
+        return self.counts
+
+    def summary(self):
+        counts = self.value_counts()
+        if self.distinct is None:
+            return CategorySummary(len(counts), True, counts.head(TOP_CATEGORIES))
+        return CategorySummary(self.distinct.count(), self.distinct.is_exact, counts.head(TOP_CATEGORIES))
+
+
+class NullMapAccumulator:
+    # Null counts per run of rows for the missing-data heatmap. Runs double in
+    # length (neighbours added up) to keep at most 2 * NULL_MAP_ROWS of them.
+    __slots__ = ("run_rows", "rows", "nulls", "sizes")
+
+    def __init__(self, k):
+        self.run_rows = 1
+        self.rows = 0
+        self.nulls = np.zeros((0, k), dtype=np.int64)
+        self.sizes = np.zeros(0, dtype=np.int64)
+
+    def update(self, nulls):
+        if len(nulls) == 0:
+            return
+        while (self.rows + len(nulls)) / self.run_rows > 2 * NULL_MAP_ROWS:
+            self.run_rows *= 2
+        other = NullMapAccumulator(nulls.shape[1])
+        starts = np.arange(0, len(nulls), self.run_rows)
+        other.run_rows, other.rows = self.run_rows, len(nulls)
+        other.nulls = np.add.reduceat(nulls.astype(np.int64), starts)
+        other.sizes = np.diff(np.append(starts, len(nulls)))
+        self.merge(other)
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.run_rows = max(self.run_rows, other.run_rows)
+        self.nulls = np.concatenate([self.nulls, other.nulls])
+        self.sizes = np.concatenate([self.sizes, other.sizes])
+        while len(self.sizes) > 2 * NULL_MAP_ROWS:
+            pairs = np.arange(0, len(self.sizes), 2)
+            self.nulls = np.add.reduceat(self.nulls, pairs)
+            self.sizes = np.add.reduceat(self.sizes, pairs)
+
+    def shares(self):
+        return self.nulls / self.sizes[:, None] if len(self.sizes) else self.nulls.astype("float64")
+
+
+class ColumnAccumulator:
+    __slots__ = ("name", "dtype", "kind", "count", "nulls", "memory", "moments", "quantiles", "categories")
+
+    def __init__(self, name, dtype, kind, quantile_k, distinct_error):
+        self.name = name
+        self.dtype = dtype
+        self.kind = kind
+        self.count = 0
+        self.nulls = 0
+        self.memory = 0
+        self.moments = MomentAccumulator() if kind == "numeric" else None
+        self.quantiles = KLLSketch(quantile_k) if kind == "numeric" else None
+        self.categories = CategoryAccumulator(distinct_error) if kind == "categorical" else None
+
+    def merge(self, other):
+        self.dtype = common_dtype(self.dtype, other.dtype)
+        self.count += other.count
+        self.nulls += other.nulls
+        self.memory += other.memory
+        if self.kind == "numeric":
+            self.moments.merge(other.moments)
+            self.quantiles.merge(other.quantiles)
+        elif self.kind == "categorical":
+            self.categories.merge(other.categories)
+
+    def profile(self):
+        column = ColumnProfile(self.name, self.dtype, self.count, self.nulls, self.memory)
+        if self.kind == "numeric":
+            column.numeric = self.moments.summary(self.quantiles.quantiles([0.25, 0.5, 0.75]))
+            items, weights = self.quantiles.weighted_items()
+            column.box = summarize_box(items, weights, column.numeric)
+            column.histogram = summarize_histogram(items, weights, column.numeric)
+        elif self.kind == "categorical":
+            column.categories = self.categories.summary()
+        return column
+
+
+class ProfileAccumulator:
+    # The whole report's state. Feed it DataFrames (all rows at once, or chunks
+    # in order) with update(), or merge() profiles of other chunks or files
+    # with the same columns, then call profile().
+    __slots__ = ("quantile_k", "distinct_error", "rows", "columns", "head", "index_memory", "comoments",
+                 "null_map", "duplicates")
+
+    def __init__(self, quantile_k=QUANTILE_K, distinct_error=DISTINCT_ERROR,
+                 duplicate_memory_rows=DUPLICATE_MEMORY_ROWS):
+        self.quantile_k = quantile_k
+        self.distinct_error = distinct_error
+        self.rows = 0
+        self.columns = None
+        self.head = None
+        self.index_memory = 0
+        self.comoments = None
+        self.null_map = None
+        self.duplicates = DuplicateAccumulator(duplicate_memory_rows)
+
+    def start(self, chunk):
+        numeric_columns = chunk.select_dtypes(include=NUMERIC_DTYPES).columns
+        categorical_columns = chunk.select_dtypes(include=CATEGORICAL_DTYPES).columns
+        self.columns = {}
+        for name in chunk.columns:
+            kind = "numeric" if name in numeric_columns else "categorical" if name in categorical_columns else None
+            self.columns[name] = ColumnAccumulator(name, chunk[name].dtype, kind, self.quantile_k,
+                                                   self.distinct_error)
+        self.comoments = CoMomentAccumulator(len(numeric_columns))
+        self.null_map = NullMapAccumulator(len(chunk.columns))
+        self.head = chunk.head(0)
+
+    def update(self, chunk):
+        if self.columns is None:
+            self.start(chunk)
+        if len(self.head) < HEAD_ROWS:
+            self.head = pd.concat([self.head, chunk.head(HEAD_ROWS - len(self.head))])
+        index_memory = chunk.index.memory_usage()
+        # A RangeIndex costs the same however many rows it spans
+        self.index_memory = index_memory if isinstance(chunk.index, pd.RangeIndex) else \
+            self.index_memory + index_memory
+        memory = chunk.memory_usage(index=False)
+        for column in self.columns.values():
+            column.dtype = common_dtype(column.dtype, chunk[column.name].dtype)
+            column.memory += memory[column.name]
+        for start in range(0, len(chunk), BLOCK_ROWS):
+            self.update_block(chunk.iloc[start:start + BLOCK_ROWS])
+        self.rows += len(chunk)
+
+    def update_block(self, block):
+        nulls = np.empty((len(block), len(self.columns)), dtype=bool)
+        numeric_values = []
+        for i, column in enumerate(self.columns.values()):
+            series = block[column.name]
+            if column.kind == "numeric":
+                values = as_float(series)
+                nulls[:, i] = np.isnan(values)
+                valid = values[~nulls[:, i]]
+                column.moments.update(valid)
+                column.quantiles.update(valid)
+                numeric_values.append(values)
+            else:
+                nulls[:, i] = series.isna().to_numpy()
+                if column.kind == "categorical":
+                    column.categories.update(series)
+            null_count = int(nulls[:, i].sum())
+            column.nulls += null_count
+            column.count += len(block) - null_count
+        if numeric_values:
+            self.comoments.update(np.column_stack(numeric_values))
+        self.null_map.update(nulls)
+        self.duplicates.update(block)
+
+    def merge(self, other):
+        if other.columns is None:
+            return
+        if self.columns is None:
+            self.start(other.head)
+        if list(other.columns) != list(self.columns):
+            raise ValueError("Only profiles of the same columns can be merged.")
+        if len(self.head) < HEAD_ROWS:
+            self.head = pd.concat([self.head, other.head.head(HEAD_ROWS - len(self.head))])
+        self.index_memory = max(self.index_memory, other.index_memory)
+        for name, column in self.columns.items():
+            column.merge(other.columns[name])
+        self.comoments.merge(other.comoments)
+        self.null_map.merge(other.null_map)
+        self.duplicates.merge(other.duplicates)
+        self.rows += other.rows
+
+    def profile(self):
+        columns = {name: column.profile() for name, column in (self.columns or {}).items()}
+        numeric_columns = [name for name, column in columns.items() if column.numeric is not None]
+        corr, cov = self.comoments.corr_cov() if self.comoments is not None else (None, None)
+        duplicates, duplicate_sample = self.duplicates.result()
+        return DataProfile(self.rows, columns, self.head, self.index_memory, duplicates, duplicate_sample,
+                           pd.DataFrame(corr, index=numeric_columns, columns=numeric_columns),
+                           pd.DataFrame(cov, index=numeric_columns, columns=numeric_columns),
+                           self.null_map.shares() if self.null_map is not None else np.zeros((0, 0)))
+
+
+# ==============================
+# Column Statistics
+# ==============================
+def as_float(series):
+    # Any numeric column (including nullable Int64/Float64) as float64 with NaN
+    # for nulls. A chunk of a numeric CSV column may come in as text when it
+    # holds stray values; those count as nulls.
+    if not pd.api.types.is_numeric_dtype(series.dtype):
+        series = pd.to_numeric(series, errors="coerce")
+    return series.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def common_dtype(a, b):
+    # The dtype pandas gives when concatenating a column of each (CSV chunks
+    # may infer int64 in one chunk and float64 in the next)
+    if a == b:
+        return a
+    return pd.concat([pd.Series(dtype=a), pd.Series(dtype=b)]).dtype
+
+
+def summarize_box(items, weights, summary):
+    # From the quantile sketch's items (each standing for `weights` values):
+    # whiskers end at the furthest item within the fences, or at the exact
+    # min/max when those are inside; outliers are the weight beyond the fences
+    if summary.count == 0:
+        return None
+    iqr = summary.q3 - summary.q1
+    low, high = summary.q1 - WHISKER * iqr, summary.q3 + WHISKER * iqr
+    inside = (items >= low) & (items <= high)
+    whislo = summary.min if summary.min >= low else items[inside].min()
+    whishi = summary.max if summary.max <= high else items[inside].max()
+    fliers = np.unique(np.concatenate([items[~inside], [value for value in (summary.min, summary.max)
+                                                         if value < low or value > high]]))
+    if len(fliers) > MAX_FLIERS:
+        # An even spread of the outliers, always including the extremes
+        fliers = np.concatenate([fliers[::len(fliers) // MAX_FLIERS], fliers[-1:]])
+    return BoxSummary(summary.q1, summary.median, summary.q3, whislo, whishi,
+                      int(round(weights[~inside].sum())), fliers)
+
+
+def histogram_bins(summary):
+    # numpy's "auto" rule (the smaller of the Freedman-Diaconis and Sturges
+    # widths), computed from the quartiles we already have
+    n, span = summary.count, summary.max - summary.min
+    if span == 0:
+        return 1
+    width = span / (np.log2(n) + 1)
+    fd_width = 2 * (summary.q3 - summary.q1) * n ** (-1 / 3)
+    if fd_width > 0:
+        width = min(width, fd_width)
+    return int(min(np.ceil(span / width), HISTOGRAM_MAX_BINS))
+
+
+def summarize_histogram(items, weights, summary):
+    if summary.count == 0:
+        return None
+    bins = histogram_bins(summary)
+    counts, edges = np.histogram(items, bins=bins, range=(summary.min, summary.max), weights=weights)
+    histogram = Histogram(counts, edges, None)
+    bandwidth = summary.std * summary.count ** (-1 / 5) if summary.count > 1 else 0
+    if bandwidth > 0:
+        # Binned KDE: each bin's count spread as a Gaussian around its center
+        centers = histogram.centers
+        distances = (centers[:, None] - centers[None, :]) / bandwidth
+        density = np.exp(-0.5 * distances ** 2) @ histogram.counts / (bandwidth * np.sqrt(2 * np.pi))
+        histogram.kde = density * (edges[1] - edges[0])
+    return histogram
+
+
+# ==============================
+# Profiling
+# ==============================
+def profile_frame(df, distinct_error=None):
+    # The frame is already in memory, so its row hashes are kept there too
+    accumulator = ProfileAccumulator(distinct_error=distinct_error, duplicate_memory_rows=max(len(df), 1))
+    accumulator.update(df)
+    profile = accumulator.profile()
+    accumulator.duplicates.close()
+    return profile
+
+
+def profile_csv(file, chunk_size=CSV_CHUNK_ROWS, quantile_k=QUANTILE_K, distinct_error=DISTINCT_ERROR,
+                **read_csv_kwargs):
+    # Reads the CSV chunk_size rows at a time, so memory stays bounded by the
+    # chunk size (plus the sketches, tracked category counts and up to
+    # DUPLICATE_MEMORY_ROWS row hashes; the rest are spilled to disk)
+    accumulator = ProfileAccumulator(quantile_k, distinct_error)
+    for chunk in pd.read_csv(file, chunksize=chunk_size, **read_csv_kwargs):
+        accumulator.update(chunk)
+    profile = accumulator.profile()
+    accumulator.duplicates.close()
+    return profile
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Duplicate rows found from one 64-bit hash per row (pd.util.hash_pandas_object),
+# computed once as the rows stream past. Hashes are held in memory up to
+# DUPLICATE_MEMORY_ROWS, then spilled to partition files on disk by their
+# top bits, so equal hashes always share a partition and each partition
+# is checked on its own. Two different rows share a hash with probability
+# about rows ** 2 / 2 ** 65 (1 in 300,000 for 10M rows).
+
+DUPLICATE_MEMORY_ROWS = 2_000_000
+# Spilled hashes go to 2 ** PARTITION_BITS files by their top bits
+PARTITION_BITS = 6
+# Duplicate row numbers kept for the report (the first ones in row order)
+DUPLICATE_SAMPLE_SIZE = 100
+ENTRY_DTYPE = np.dtype([("hash", np.uint64), ("row", np.int64)])
+
+
+def row_hashes(frame):
+    # Numbers are hashed as float64, so a CSV column read as int64 in one chunk
+    # and float64 in the next hashes the same values the same way
+    numeric = frame.select_dtypes(include="number").columns
+    if len(numeric):
+        frame = frame.astype({name: "float64" for name in numeric})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+class DuplicateAccumulator:
+    # Rows are numbered in the order they are added. Like df.duplicated(), the
+    # first occurrence of a row is not a duplicate; later ones are.
+    __slots__ = ("memory_rows", "directory", "rows", "pending", "pending_size", "spilled", "_tempdir")
+
+    def __init__(self, memory_rows=DUPLICATE_MEMORY_ROWS, directory=None):
+        self.memory_rows = memory_rows
+        self.directory = directory
+        self.rows = 0
+        self.pending = []
+        self.pending_size = 0
+        self.spilled = False
+        self._tempdir = None
+
+    def update(self, frame):
+        self.add(row_hashes(frame), np.arange(self.rows, self.rows + len(frame)))
+        self.rows += len(frame)
+
+    def merge(self, other):
+        # Appends the other accumulator's rows after ours
+        for entries in other.partitions():
+            self.add(entries["hash"], entries["row"] + self.rows)
+        self.rows += other.rows
+
+    def add(self, hashes, rows):
+        entries = np.empty(len(hashes), dtype=ENTRY_DTYPE)
+        entries["hash"] = hashes
+        entries["row"] = rows
+        self.pending.append(entries)
+        self.pending_size += len(entries)
+        if self.pending_size > self.memory_rows:
+            self.spill()
+
+    def partition_path(self, partition):
+        if self._tempdir is None:
+            self._tempdir = tempfile.TemporaryDirectory(prefix="duplicates-", dir=self.directory)
+        return os.path.join(self._tempdir.name, f"part-{partition:03d}.bin")
+
+    def spill(self):
+        # Appends the pending hashes to their partition files, keeping row order
+        if not self.pending:
+            return
+        entries = np.concatenate(self.pending)
+        partitions = (entries["hash"] >> np.uint64(64 - PARTITION_BITS)).astype(np.int64)
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(partitions, minlength=2 ** PARTITION_BITS))])
+        entries = entries[np.argsort(partitions, kind="stable")]
+        for partition in range(2 ** PARTITION_BITS):
+            if bounds[partition + 1] > bounds[partition]:
+                with open(self.partition_path(partition), "ab") as file:
+                    entries[bounds[partition]:bounds[partition + 1]].tofile(file)
+        self.pending = []
+        self.pending_size = 0
+        self.spilled = True
+
+    def partitions(self):
+        # Yields every (hash, row) entry, one partition at a time. Equal hashes
+        # share a partition and stay in row order.
+        if not self.spilled:
+            if self.pending:
+                yield np.concatenate(self.pending)
+            return
+        self.spill()
+        for partition in range(2 ** PARTITION_BITS):
+            path = self.partition_path(partition)
+            if os.path.exists(path):
+                yield np.fromfile(path, dtype=ENTRY_DTYPE)
+
+    def result(self, sample_size=DUPLICATE_SAMPLE_SIZE):
+        # (duplicate count, the first sample_size duplicate row numbers)
+        count = 0
+        sample = np.zeros(0, dtype=np.int64)
+        for entries in self.partitions():
+            # A stable sort keeps equal hashes in row order, so every entry
+            # equal to the one before it is a later occurrence
+            hashes = entries["hash"]
+            order = np.argsort(hashes, kind="stable")
+            repeated = hashes[order][1:] == hashes[order][:-1]
+            duplicate_rows = entries["row"][order][1:][repeated]
+            count += len(duplicate_rows)
+            sample = np.concatenate([sample, duplicate_rows])
+            if len(sample) > sample_size:
+                sample = np.partition(sample, sample_size - 1)[:sample_size]
+        return count, np.sort(sample)
+
+    def close(self):
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+            self._tempdir = None
+            self.spilled = False
@@ -0,0 +1,200 @@
+import numpy as np
+
+# Mergeable summaries of a column that use bounded memory however many rows
+# are folded in. Like the accumulators in data_profile, each has update() for
+# a block of values and merge() for another sketch built with the same settings.
+
+# Distinct hashes kept exactly before a HyperLogLog switches to registers
+EXACT_DISTINCT_LIMIT = 50_000
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+# KLL: items kept by the top compactor; lower ones keep 2/3 as many as the
+# one above, down to MIN_COMPACTOR_SIZE. Rank error shrinks about as 1 / k.
+QUANTILE_K = 4096
+COMPACTOR_RATIO = 2 / 3
+MIN_COMPACTOR_SIZE = 8
+SKETCH_SEED = 0
+
+
+# ==============================
+# HyperLogLog
+# ==============================
+def hll_precision(error):
+    # HyperLogLog's relative standard error is about 1.04 / sqrt(2 ** precision)
+    precision = int(np.ceil(np.log2((1.04 / error) ** 2)))
+    return min(max(precision, MIN_PRECISION), MAX_PRECISION)
+
+
+def leading_zeros(values):
+    # Leading zero bits of uint64 values, from the float exponents of the two
+    # 32-bit halves (each converts to float64 exactly)
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    highest_bit = np.where(high > 0, np.frexp(high)[1] + 31, np.frexp(low)[1] - 1)
+    return 63 - highest_bit
+
+
+def sorted_unique(values):
+    # np.unique, but a plain sort is many times faster for uint64 hashes
+    values = np.sort(values)
+    return values[np.concatenate([[True], values[1:] != values[:-1]])] if len(values) else values
+
+
+def _sigma(x):
+    if x == 1:
+        return np.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x):
+    if x == 0 or x == 1:
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = np.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+class HyperLogLog:
+    # Distinct count of 64-bit hashes with relative standard error `error`.
+    # Exact (a set of the hashes) up to `exact_limit` distinct values, then
+    # 2 ** precision registers of one byte each.
+    __slots__ = ("precision", "exact_limit", "exact", "registers")
+
+    def __init__(self, error=0.01, exact_limit=EXACT_DISTINCT_LIMIT):
+        self.precision = hll_precision(error)
+        self.exact_limit = exact_limit
+        self.exact = np.zeros(0, dtype=np.uint64)
+        self.registers = None
+
+    def update(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if self.registers is None:
+            self.exact = sorted_unique(np.concatenate([self.exact, hashes]))
+            if len(self.exact) > self.exact_limit:
+                self.registers = np.zeros(2 ** self.precision, dtype=np.uint8)
+                self.add_to_registers(self.exact)
+                self.exact = None
+        else:
+            self.add_to_registers(hashes)
+
+    def add_to_registers(self, hashes):
+        # The first `precision` bits pick the register, which keeps the longest
+        # run of leading zeros (plus one) seen in the remaining bits
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        rank = np.minimum(leading_zeros(hashes << np.uint64(self.precision)) + 1, 64 - self.precision + 1)
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Only HyperLogLog sketches of the same precision can be merged.")
+        if other.registers is None:
+            self.update(other.exact)
+            return
+        if self.registers is None:
+            exact = self.exact
+            self.registers = other.registers.copy()
+            self.exact = None
+            self.add_to_registers(exact)
+        else:
+            np.maximum(self.registers, other.registers, out=self.registers)
+
+    @property
+    def is_exact(self):
+        return self.registers is None
+
+    def count(self):
+        if self.registers is None:
+            return len(self.exact)
+        # Ertl's improved estimator ("New cardinality estimation algorithms for
+        # HyperLogLog sketches", 2017): no bias tables or range switches needed
+        m = len(self.registers)
+        q = 64 - self.precision
+        histogram = np.bincount(self.registers, minlength=q + 2)
+        z = m * _tau(1 - histogram[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * _sigma(histogram[0] / m)
+        return int(round(m * m / (2 * np.log(2)) / z))
+
+
+# ==============================
+# KLL Quantile Sketch
+# ==============================
+class KLLSketch:
+    # Karnin-Lang-Liberty quantile sketch. levels[h] holds items that each
+    # stand for 2 ** h values; a full level is sorted and every other item
+    # (from a random offset) moves up a level. Exact, with every value kept,
+    # until the first compaction (up to about k values).
+    __slots__ = ("k", "count", "levels", "rng")
+
+    def __init__(self, k=QUANTILE_K, seed=SKETCH_SEED):
+        self.k = k
+        self.count = 0
+        self.levels = [np.zeros(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def capacity(self, level):
+        return max(MIN_COMPACTOR_SIZE, int(self.k * COMPACTOR_RATIO ** (len(self.levels) - 1 - level)))
+
+    def update(self, values):
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.count += len(values)
+        self.compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.zeros(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.compress()
+
+    def compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) <= self.capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.zeros(0))
+            items = np.sort(self.levels[level])
+            # An odd item out stays behind at this level
+            kept, items = items[:len(items) % 2], items[len(items) % 2:]
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[self.rng.integers(2)::2]])
+            self.levels[level] = kept
+            # A new level lowers the capacity of all the others
+            level = 0
+
+    @property
+    def is_exact(self):
+        return len(self.levels) == 1
+
+    def weighted_items(self):
+        # The retained items, sorted, and how many values each stands for
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantiles(self, qs):
+        if self.count == 0:
+            return np.full(len(qs), np.nan)
+        if self.is_exact:
+            # Linear interpolation, as DataFrame.describe/quantile do
+            return np.quantile(self.levels[0], qs)
+        items, weights = self.weighted_items()
+        cumulative = np.cumsum(weights)
+        positions = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1], side="left")
+        return items[np.minimum(positions, len(items) - 1)]
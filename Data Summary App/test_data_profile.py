@@ -0,0 +1,72 @@
+import io
+import unittest
+import numpy as np
+import pandas as pd
+from data_profile import profile_csv, profile_frame
+
+# A CSV profiled in chunks gives the same report as the whole frame profiled
+# in memory, and both match pandas
+
+ROWS = 400
+CHUNK_SIZE = 37
+
+
+def sample_csv():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        "id": np.arange(ROWS) % 350,
+        "price": rng.normal(50, 12, ROWS).round(2),
+        "quantity": rng.integers(1, 20, ROWS),
+        "city": rng.choice(["Pune", "Delhi", "Mumbai", "Chennai"], ROWS),
+    })
+    df["quantity"] = df["quantity"].astype("float64")
+    df.loc[rng.random(ROWS) < 0.1, "quantity"] = np.nan
+    df.loc[rng.random(ROWS) < 0.05, "city"] = None
+    # Rows 350.. repeat earlier ids, and some of them whole earlier rows
+    df.loc[350:379, ["price", "quantity", "city"]] = df.loc[0:29, ["price", "quantity", "city"]].to_numpy()
+    return df.to_csv(index=False)
+
+
+class ProfileCsvTest(unittest.TestCase):
+    def setUp(self):
+        text = sample_csv()
+        self.df = pd.read_csv(io.StringIO(text))
+        self.whole = profile_frame(self.df)
+        self.chunked = profile_csv(io.StringIO(text), chunk_size=CHUNK_SIZE, distinct_error=None)
+
+    def test_rows_and_duplicates(self):
+        self.assertEqual(self.chunked.rows, ROWS)
+        self.assertEqual(self.chunked.duplicates, self.whole.duplicates)
+        self.assertEqual(self.chunked.duplicates, self.df.duplicated().sum())
+        self.assertEqual(list(self.chunked.duplicate_sample), list(self.whole.duplicate_sample))
+
+    def test_numeric_summaries(self):
+        self.assertEqual(self.chunked.numeric_columns, self.whole.numeric_columns)
+        for name in self.whole.numeric_columns:
+            whole = self.whole.columns[name]
+            chunked = self.chunked.columns[name]
+            self.assertEqual(chunked.count, whole.count)
+            self.assertEqual(chunked.nulls, whole.nulls)
+            describe = self.df[name].describe()
+            for field, expected in [("mean", describe["mean"]), ("std", describe["std"]), ("min", describe["min"]),
+                                    ("median", describe["50%"]), ("max", describe["max"]),
+                                    ("skew", self.df[name].skew()), ("kurt", self.df[name].kurt())]:
+                self.assertAlmostEqual(getattr(chunked.numeric, field), getattr(whole.numeric, field), places=9)
+                self.assertAlmostEqual(getattr(chunked.numeric, field), expected, places=9)
+
+    def test_correlation(self):
+        pd.testing.assert_frame_equal(self.chunked.corr, self.whole.corr)
+        numeric = self.df[self.whole.numeric_columns]
+        pd.testing.assert_frame_equal(self.chunked.corr, numeric.corr(), check_exact=False)
+        pd.testing.assert_frame_equal(self.chunked.cov, numeric.cov(), check_exact=False)
+
+    def test_categories(self):
+        whole = self.whole.columns["city"].categories
+        chunked = self.chunked.columns["city"].categories
+        self.assertEqual(chunked.unique, self.df["city"].nunique())
+        self.assertEqual(chunked.unique, whole.unique)
+        pd.testing.assert_series_equal(chunked.top, whole.top, check_names=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,9 @@ import streamlit as st
 import pandas as pd
 from faker import Faker
 import random
+import numpy as np
+from pattern_kernel import bothify, bothify_choice
+from faker_pools import sample
 
 # Initialize Faker
 faker = Faker()
@@ -62,6 +65,10 @@ diff_formats = ["number", "float", "date", "name", "alphanumeric", "address",
                 "email","phone_numbers","zip_code","status_flags","age",
                 "sku","percentages","ratings","levels","product_name"]
 
+# Template formats generated a whole column at a time (see pattern_kernel.py)
+alphanumeric_formats = ['##??', '??##', '#?#?', '???']
+pattern_formats = {"phone_numbers": '###-###-#####', "zip_code": '###-###', "sku": 'SKU#?#?#?#?'}
+
 # Dynamic input for columns
 
 for i, col in enumerate(st.session_state.columns):
@@ -105,14 +112,28 @@ if st.button("Generate Synthetic Data"):
     if not st.session_state.columns:
         st.error("No columns defined. Please add at least one column.")
     else:
+        # Build template and address columns with one vectorized call each,
+        # keyed by column position since several columns may share a name
+        rng = np.random.default_rng()
+        column_values = {}
+        for i, col in enumerate(st.session_state.columns):
+            if col["dtype"] == "alphanumeric":
+                column_values[i] = bothify_choice(alphanumeric_formats, row_count, rng)
+            elif col["dtype"] in pattern_formats:
+                column_values[i] = bothify(pattern_formats[col["dtype"]], row_count, rng)
+            elif col["dtype"] == "address":
+                column_values[i] = sample("address", row_count, rng)
+
         # Create fake data based on the metadata
         fake_data = []
-        for _ in range(row_count):
+        for row_index in range(row_count):
             row = {}
-            for col in st.session_state.columns:
+            for i, col in enumerate(st.session_state.columns):
                 # if col["dtype"] == "text":
                 #     row[col["name"]] = faker.word()
-                if col["dtype"] == "name":
+                if i in column_values:
+                    row[col["name"]] = column_values[i][row_index]
+                elif col["dtype"] == "name":
                     name = faker.name()
                     row[col["name"]] = name
                 elif col["dtype"] == "number":
@@ -123,10 +144,6 @@ if st.button("Generate Synthetic Data"):
                     row[col["name"]] = round(faker.random.uniform(0.0, 100.0), 2)
                 elif col["dtype"] == "date":
                     row[col["name"]] = faker.date_this_century()
-                elif col["dtype"] == "alphanumeric":
-                    row[col["name"]] = faker.bothify(text=random.choice(['##??', '??##', '#?#?', '???']))
-                elif col["dtype"] == "address":
-                    row[col["name"]] = faker.address()
                 elif col["dtype"] == "city":
                     row[col["name"]] = faker.city()
                 elif col["dtype"] == "M/F":
@@ -147,10 +164,6 @@ if st.button("Generate Synthetic Data"):
                     name_parts = name.lower().replace(".", "").split()
                     email = f"{name_parts[0]}.{name_parts[-1]}@domain.com"
                     row[col["name"]] = email
-                elif col["dtype"] == "phone_numbers":
-                    row[col["name"]] = faker.bothify(text=random.choice(['###-###-#####']))
-                elif col["dtype"] == "zip_code":
-                    row[col["name"]] = faker.bothify(text=random.choice(['###-###']))
                 elif col["dtype"] == "status_flags":
                     row[col["name"]] = faker.bothify(text=random.choice(['Active','Inactive']))
                 elif col["dtype"] == "age":
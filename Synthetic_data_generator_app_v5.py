@@ -1,89 +1,38 @@
 import numpy as np
 import streamlit as st
 import pandas as pd
-from faker import Faker
-import random
-import zipfile
-import io
 import json
-
-# Initialize Faker
-faker = Faker()
+import random
+from columnar_engine import (DEFAULT_CHUNK_SIZE, DEFAULT_KEY_TEMPLATE, KEY_DTYPES, compile_table_config,
+                              generate_synthetic_data, link_foreign_keys)
+from exporters import EXPORT_FORMATS, download_export, write_zip
+from generation_cache import cached_table_columns
+from parallel_generation import default_workers, iter_parallel_table_chunks
 
 # Ensure session state for tables is initialized
 if "tables" not in st.session_state:
     st.session_state["tables"] = {}
 
+# Rows shown per table preview. Only the preview is kept in the session; the
+# whole table is generated chunk by chunk when the download is clicked.
+PREVIEW_ROWS = 1000
+# Session-only keys of a table config, never saved or used to generate
+GENERATED_KEYS = ["preview", "generated_config"]
+
 # ==============================
 # Main Data Generation Functions
 # ==============================
-def generate_synthetic_data(table_config):
-    rows = table_config["rows"]
-    columns = table_config["columns"]
-    fake_data = []
-
-    for row_index in range(1, rows + 1):
-        row = {}
-        for col in columns:
-            null_chance = col.get("null_percentage", 0) / 100
-            if col["nullable"] and random.random() < null_chance:
-                row[col["name"]] = None
-            elif col["dtype"] == "index":
-                row[col["name"]] = row_index
-            elif col["dtype"] == "name":
-                name = faker.name()
-                row[col["name"]] = name
-            elif col["dtype"] == "number":
-                row[col["name"]] = faker.random_int(
-                    min=int(col.get("min", 0)), max=int(col.get("max", 100))
-                )
-            elif col["dtype"] == "float":
-                row[col["name"]] = round(
-                    faker.random.uniform(col.get("min", 0), col.get("max", 100)), 2
-                )
-            elif col["dtype"] == "contains":
-                custom_values = [value.strip() for value in col["custom_values"].split(",") if value.strip()]
-                row[col["name"]] = random.choice(custom_values) if custom_values else None
-            elif col["dtype"] == "custom":
-                custom_values = [value.strip() for value in col["custom_examples"].split(",") if value.strip()]
-                row[col["name"]] = random.choice(custom_values) if custom_values else "No Custom Value"
-            elif col["dtype"] == "date":
-                row[col["name"]] = faker.date_between(
-                    start_date=col.get("start_date"), end_date=col.get("end_date")
-                )
-            elif col["dtype"] == "alphanumeric":
-                row[col["name"]] = faker.bothify(text="??##")
-            elif col["dtype"] == "city":
-                row[col["name"]] = faker.city()
-            elif col["dtype"] == "email":
-                fake_name = faker.name()  # Generate a fake name if not already defined
-                name_parts = fake_name.lower().replace(".", "").split()
-                row[col["name"]] = f"{name_parts[0]}.{name_parts[-1]}@domain.com"
-        fake_data.append(row)
-
-    return pd.DataFrame(fake_data)
+# generate_synthetic_data builds each column in one vectorized call (columnar_engine.py);
+# iter_parallel_table_chunks spreads a table's chunks over worker processes
 
 
 def validate_table_config(table_config):
-    for col in table_config["columns"]:
-        if not col["nullable"] and col["dtype"] in ["contains", "custom"]:
-            custom_values = [value.strip() for value in col.get("custom_values", "").split(",") if value.strip()]
-            if not custom_values and col["dtype"] == "contains":
-                st.error(f"Error: Column '{col['name']}' must have valid values or be nullable.")
-                return False
-            if col["dtype"] == "custom":
-                custom_examples = [value.strip() for value in col.get("custom_examples", "").split(",") if value.strip()]
-                if not custom_examples:
-                    st.error(f"Error: Column '{col['name']}' must have valid examples.")
-                    return False
-        if col["dtype"] in ["number", "float"]:
-            if col["max"] < col["min"]:
-                st.error(f"Error: Max value for column '{col['name']}' cannot be less than Min value.")
-                return False
-        if col["dtype"] == "date":
-            if col.get("end_date") and col.get("start_date") and col["end_date"] < col["start_date"]:
-                st.error(f"Error: End Date for column '{col['name']}' cannot be earlier than Start Date.")
-                return False
+    # Compiling validates the config; the plan is cached and reused for generation
+    try:
+        compile_table_config(table_config)
+    except ValueError as error:
+        st.error(f"Error: {error}")
+        return False
     return True
 
 
@@ -91,8 +40,9 @@ def prepare_config_for_saving(tables):
     clean_config = {}
     for table_name, config in tables.items():
         clean_table = config.copy()
-        if "data" in clean_table:
-            del clean_table["data"]
+        for key in GENERATED_KEYS:
+            if key in clean_table:
+                del clean_table[key]
         clean_config[table_name] = clean_table
     return clean_config
 
@@ -128,9 +78,12 @@ if st.session_state.show_description:
     #### Supported Data Types:
     - **Number**: Integer values within a specified range.
     - **Float**: Decimal values within a specified range.
-    - **Date**: Dates between a specified start and end date.
+    - **Date**: Dates between a specified start and end date, optionally with a time of day.
     - **Contains**: Predefined custom values (comma-separated).
     - **Alphanumeric**: Random strings with letters and numbers.
+    - **Unique**: Keys that never repeat within a table, filled into a template such as `ID#########`.
+    - **Foreign Key**: Keys of another table's index or unique column, spread uniformly or skewed towards a few parents.
+    - **Expression**: Derived from other columns of the same row, e.g. `Quantity * Price` or `email(Name)`.
     - **Name, City, Email**: Fake but realistic names, city names, and email addresses.
 
     #### Note:
@@ -141,7 +94,7 @@ if st.session_state.show_description:
 st.sidebar.title("🔄 Save and Load Configuration")
 if st.sidebar.button("Save Configuration"):
     config_to_save = prepare_config_for_saving(st.session_state.tables)
-    config_json = json.dumps(config_to_save, indent=4)
+    config_json = json.dumps(config_to_save, indent=4, default=str)  # dates are saved as ISO strings
     st.sidebar.download_button(
         label="Download Configuration",
         data=config_json,
@@ -155,6 +108,12 @@ if uploaded_file is not None:
     st.session_state.tables = loaded_config
     st.sidebar.success("Configuration loaded successfully!")
 
+# Generation Settings
+st.sidebar.title("⚙️ Generation Settings")
+workers = st.sidebar.number_input("Worker processes", min_value=1, max_value=default_workers(), value=1, step=1)
+export_format = st.sidebar.selectbox("File Format", list(EXPORT_FORMATS))
+writer, extension, _ = EXPORT_FORMATS[export_format]
+
 # Table Management
 st.subheader("📑 Manage Tables")
 col1, col2 = st.columns(2)
@@ -175,9 +134,13 @@ with col2:
 for table_name, table_config in st.session_state.tables.items():
     st.markdown(f"### 📝 Configure Table: `{table_config.get('name', table_name)}`")
     new_name = st.text_input(f"Table Name", value=table_config.get("name", table_name), key=f"table_name_{table_name}")
-    row_count = st.number_input(f"Rows for `{new_name}`", min_value=1, max_value=50000, step=1, key=f"rows_{table_name}")
+    row_count = st.number_input(f"Rows for `{new_name}`", min_value=1, max_value=5000000, step=1, key=f"rows_{table_name}")
+    # Same seed -> same data, whatever the number of worker processes
+    seed = st.number_input(f"Seed for `{new_name}`", min_value=0, max_value=2**32 - 1,
+                           value=int(table_config.get("seed", random.randrange(2**32))), step=1, key=f"seed_{table_name}")
     st.session_state.tables[table_name]["rows"] = row_count
     st.session_state.tables[table_name]["name"] = new_name
+    st.session_state.tables[table_name]["seed"] = seed
 
 
 
@@ -189,7 +152,8 @@ for table_name, table_config in st.session_state.tables.items():
         with col2:
             col["dtype"] = st.selectbox(
                 "Data Type",
-                ["number", "float", "date", "name", "city", "email", "contains", "index"],
+                ["number", "float", "date", "name", "city", "email", "contains", "index", "unique", "foreign_key",
+                 "expression"],
                 index=0,
                 key=f"{table_name}_col_dtype_{i}",
             )
@@ -198,7 +162,7 @@ for table_name, table_config in st.session_state.tables.items():
                 "Nullable",
                 value=col.get("nullable", False),
                 key=f"{table_name}_nullable_{i}",
-                disabled=(col["dtype"] == "index"),  # Disable for Index format
+                disabled=(col["dtype"] in ["index", "unique"]),  # Disable for Index and key formats
             )
         with col4:
             col["null_percentage"] = st.slider(
@@ -207,7 +171,7 @@ for table_name, table_config in st.session_state.tables.items():
                 100,
                 value=int(col.get("null_percentage", 0)),
                 key=f"{table_name}_null_percentage_{i}",
-                disabled=(col["dtype"] == "index"),  # Disable for Index format
+                disabled=(col["dtype"] in ["index", "unique"]),  # Disable for Index and key formats
             )
 
         # Additional Config
@@ -222,11 +186,41 @@ for table_name, table_config in st.session_state.tables.items():
         elif col["dtype"] == "custom":
             with col5:
                 col["custom_examples"] = st.text_input("Custom Examples (comma-separated)", value=col.get("custom_examples", ""), key=f"{table_name}_col_custom_examples_{i}")
+        elif col["dtype"] == "unique":
+            with col5:
+                col["template"] = st.text_input("Key Template (# digit, ? letter)", value=col.get("template", DEFAULT_KEY_TEMPLATE), key=f"{table_name}_col_template_{i}")
+        elif col["dtype"] == "expression":
+            with col5:
+                col["expression"] = st.text_input(
+                    "Expression", value=col.get("expression", ""), key=f"{table_name}_col_expression_{i}",
+                    placeholder="Quantity * Price",
+                    help="Other columns by name with + - * / // % **, comparisons, & | ~ and "
+                         "abs, round, minimum, maximum, where, randint, uniform, text, lower, upper, "
+                         "strip, replace, first_word, last_word, concat, email. + joins text.")
+        elif col["dtype"] == "foreign_key":
+            # Any index or unique column of a table can be referenced
+            key_columns = [
+                (other_config.get("name", other_name), other_col["name"])
+                for other_name, other_config in st.session_state.tables.items()
+                for other_col in other_config["columns"] if other_col["dtype"] in KEY_DTYPES
+            ]
+            current_ref = (col.get("ref_table"), col.get("ref_column"))
+            with col5:
+                ref = st.selectbox("References", key_columns,
+                                   index=key_columns.index(current_ref) if current_ref in key_columns else None,
+                                   format_func=lambda ref: f"{ref[0]}.{ref[1]}", key=f"{table_name}_col_ref_{i}")
+                col["ref_table"], col["ref_column"] = ref if ref else (None, None)
+            with col6:
+                col["fanout"] = st.selectbox("Fan-out", ["uniform", "skewed"],
+                                             index=1 if col.get("fanout") == "skewed" else 0, key=f"{table_name}_col_fanout_{i}")
+                if col["fanout"] == "skewed":
+                    col["skew"] = st.number_input("Skew", min_value=0.1, value=float(col.get("skew", 1.0)), step=0.1, key=f"{table_name}_col_skew_{i}")
         elif col["dtype"] == "date":
             with col5:
                 col["start_date"] = st.date_input("Start Date", key=f"{table_name}_col_start_date_{i}")
             with col6:
                 col["end_date"] = st.date_input("End Date", key=f"{table_name}_col_end_date_{i}")
+                col["timestamp"] = st.checkbox("Include Time", value=col.get("timestamp", False), key=f"{table_name}_col_timestamp_{i}")
 
         # Move Buttons BELOW the column configurations
     st.markdown("---")  # Adds a separator for better UI
@@ -243,27 +237,48 @@ for table_name, table_config in st.session_state.tables.items():
 # Generate Data
 st.subheader("🔄 Generate Data")
 if st.button("Generate Data"):
-    for table_name, table_config in st.session_state.tables.items():
+    # Foreign keys are computed from their parent's row count and seed, so the
+    # tables can be generated in any order
+    for table_name, table_config in link_foreign_keys(prepare_config_for_saving(st.session_state.tables)).items():
         if validate_table_config(table_config):
-            st.session_state.tables[table_name]["data"] = generate_synthetic_data(table_config)
+            # The preview is the start of the table's first chunk, so it matches
+            # the download. Only columns whose config or seed changed are regenerated.
+            first_chunk = dict(table_config, rows=min(table_config["rows"], DEFAULT_CHUNK_SIZE))
+            preview = cached_table_columns(first_chunk, table_config["seed"],
+                                           lambda config: generate_synthetic_data(config, config["seed"]))
+            st.session_state.tables[table_name]["preview"] = preview.head(PREVIEW_ROWS)
+            st.session_state.tables[table_name]["generated_config"] = table_config
             st.success(f"Data generated for table `{table_config.get('name', table_name)}`!")
             st.markdown(f"**Preview of `{table_config.get('name', table_name)}`:**")
 
-            # Display the preview
-            df = st.session_state.tables[table_name]["data"]
+            # Display the preview (the first PREVIEW_ROWS rows; the download has them all)
+            df = st.session_state.tables[table_name]["preview"]
             st.dataframe(df.reset_index(drop=True))  # Remove index column
 
 # Download Data
 st.subheader("⏬ Download Data")
-if st.button("Download All Tables"):
-    if not st.session_state.tables:
+generated_tables = {
+    f"{table_config.get('name', table_name)}{extension}": table_config["generated_config"]
+    for table_name, table_config in st.session_state.tables.items()
+    if "generated_config" in table_config
+}
+
+
+def build_zip():
+    # Called only when the download is clicked. Each table is generated and
+    # written into the archive chunk by chunk (one row group per chunk for
+    # Parquet), so only a few chunks are in memory at a time. Tables are
+    # compressed in parallel threads, or one after another when each already
+    # uses a pool of worker processes. The archive is built in a temporary
+    # file and handed over as a file object, never as bytes of ours.
+    zip_tables = {file_name: iter_parallel_table_chunks(config, config["seed"], workers=workers)
+                  for file_name, config in generated_tables.items()}
+    zip_workers = 1 if workers > 1 else None
+    return download_export(lambda tables, file: write_zip(tables, file, writer, zip_workers), zip_tables)
+
+
+if not generated_tables:
+    if st.button("Download All Tables"):
         st.error("No tables available for download.")
-    else:
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for table_name, table_config in st.session_state.tables.items():
-                if "data" in table_config:
-                    csv_data = table_config["data"].to_csv(index=False)
-                    zip_file.writestr(f"{table_config.get('name', table_name)}.csv", csv_data)
-        zip_buffer.seek(0)
-        st.download_button("Download ZIP", data=zip_buffer, file_name="synthetic_data.zip", mime="application/zip")
+else:
+    st.download_button("Download All Tables", data=build_zip, file_name="synthetic_data.zip", mime="application/zip")
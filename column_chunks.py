@@ -0,0 +1,34 @@
+import numpy as np
+
+# A generated chunk starts as a dict of column name -> values: NumPy arrays,
+# CategoryCodes for fixed-vocabulary columns, or pandas arrays for nullable
+# and text results. pandas is only imported when a chunk becomes a DataFrame
+# (or a column needs pandas), so chunks written straight to CSV never load it.
+
+
+class CategoryCodes:
+    # Integer codes into a list of categories (-1 for missing), standing in
+    # for a pd.Categorical until the chunk becomes a DataFrame
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.codes)
+
+    def to_pandas(self):
+        import pandas as pd  # only once the column is used as a DataFrame/Series
+        return pd.Categorical.from_codes(self.codes, categories=self.categories)
+
+    def to_text(self):
+        # One category per row, "" for missing (code -1 picks the trailing "")
+        return np.array(list(self.categories) + [""], dtype=object)[self.codes]
+
+
+def chunk_frame(columns):
+    # The DataFrame of a column chunk; CategoryCodes become Categoricals
+    import pandas as pd
+    return pd.DataFrame({name: values.to_pandas() if isinstance(values, CategoryCodes) else values
+                         for name, values in columns.items()})
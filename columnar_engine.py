@@ -0,0 +1,481 @@
+import hashlib
+import json
+import zlib
+import numpy as np
+from datetime import date, timedelta
+from column_chunks import CategoryCodes, chunk_frame
+from expressions import Expression, evaluation_order
+from faker_pools import DEFAULT_LOCALE, get_derived_pool, sample, sample_pool
+from memory_lru import MemoryLRU
+from pattern_kernel import bothify
+from unique_keys import check_key_capacity, key_permutation, skewed_indexes, template_keys
+
+# Rows generated per chunk when a table is streamed
+DEFAULT_CHUNK_SIZE = 100_000
+# Rows each expression is evaluated on when its table config is checked
+EXPRESSION_SAMPLE_ROWS = 8
+EXPRESSION_SAMPLE_SEED = 0
+# Template of "unique" columns that do not set their own
+DEFAULT_KEY_TEMPLATE = "ID#########"
+# Column types a foreign_key column can reference
+KEY_DTYPES = ["index", "unique"]
+
+
+# ==============================
+# Helpers
+# ==============================
+def split_custom_values(text):
+    return [value.strip() for value in (text or "").split(",") if value.strip()]
+
+
+def to_datetime64(value, default):
+    if value is None or value == "":
+        value = default
+    try:
+        return np.datetime64(value, "D")
+    except (TypeError, ValueError):
+        import pandas as pd  # dates NumPy cannot parse (e.g. "01/31/2024")
+        return np.datetime64(pd.Timestamp(value).date(), "D")
+
+
+def date_span(start_date=None, end_date=None):
+    # Same defaults as faker.date_between: the last 30 years up to today
+    today = date.today()
+    start = to_datetime64(start_date, today - timedelta(days=365 * 30))
+    end = to_datetime64(end_date, today)
+    return start, int((end - start).astype(int)) + 1
+
+
+def random_dates(rng, rows, start_date=None, end_date=None):
+    # datetime64[D] offsets from the start date, end date included
+    start, span_days = date_span(start_date, end_date)
+    return start + rng.integers(0, span_days, size=rows)
+
+
+def email_from_name(name):
+    name_parts = name.lower().replace(".", "").split()
+    return f"{name_parts[0]}.{name_parts[-1]}@domain.com"
+
+
+# ==============================
+# Column Generators
+# ==============================
+# Each column type parses its config once into a generator object; a chunk
+# then only draws values. The objects are small and picklable, so a compiled
+# plan is what gets sent to worker processes.
+class ColumnGenerator:
+    __slots__ = ("name", "stream", "null_chance")
+
+    def __init__(self, col):
+        self.name = col["name"]
+        # Each (chunk, column name) gets its own stream for a given seed, so a
+        # column's values do not depend on the other columns of the table
+        self.stream = zlib.crc32(self.name.encode())
+        self.null_chance = col.get("null_percentage", 0) / 100 if col.get("nullable") else 0
+
+    def rng(self, seed, chunk_index):
+        return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index, self.stream)))
+
+    def generate(self, rows, start, seed, chunk_index, data=None):
+        rng = self.rng(seed, chunk_index)
+        return apply_nulls(self.values(rows, rng, start), self.null_chance, rng)
+
+    def values(self, rows, rng, start):
+        raise NotImplementedError
+
+
+class IndexColumn(ColumnGenerator):
+    __slots__ = ()
+
+    def values(self, rows, rng, start):
+        # start is the table row offset of this chunk, so the index stays continuous
+        return np.arange(start + 1, start + rows + 1)
+
+    def keys(self, indexes, seed):
+        return indexes.astype(np.int64) + 1
+
+
+class FakerColumn(ColumnGenerator):
+    __slots__ = ("locale",)
+    provider = None
+
+    def __init__(self, col):
+        super().__init__(col)
+        self.locale = col.get("locale", DEFAULT_LOCALE)
+
+    def values(self, rows, rng, start):
+        return sample(self.provider, rows, rng, self.locale)
+
+
+class NameColumn(FakerColumn):
+    __slots__ = ()
+    provider = "name"
+
+
+class CityColumn(FakerColumn):
+    __slots__ = ()
+    provider = "city"
+
+
+class EmailColumn(FakerColumn):
+    __slots__ = ()
+
+    def values(self, rows, rng, start):
+        return sample_pool(get_derived_pool("email", "name", email_from_name, self.locale), rows, rng)
+
+
+class NumberColumn(ColumnGenerator):
+    __slots__ = ("low", "high")
+
+    def __init__(self, col):
+        super().__init__(col)
+        self.low = col.get("min", 0)
+        self.high = col.get("max", 100)
+
+    def values(self, rows, rng, start):
+        return rng.integers(int(self.low), int(self.high), size=rows, endpoint=True)
+
+
+class FloatColumn(NumberColumn):
+    __slots__ = ()
+
+    def values(self, rows, rng, start):
+        return np.round(rng.uniform(self.low, self.high, size=rows), 2)
+
+
+class ChoiceColumn(ColumnGenerator):
+    # Sampled as codes into the distinct values; repeated values keep their weight
+    __slots__ = ("categories", "value_codes")
+    values_key = None
+    empty_value = None
+
+    def __init__(self, col):
+        super().__init__(col)
+        values = split_custom_values(col.get(self.values_key))
+        self.categories = list(dict.fromkeys(values))
+        codes = {value: code for code, value in enumerate(self.categories)}
+        self.value_codes = np.array([codes[value] for value in values], dtype=np.int32)
+
+    def values(self, rows, rng, start):
+        if not self.categories:
+            return np.full(rows, self.empty_value, dtype=object)
+        codes = self.value_codes[rng.integers(0, len(self.value_codes), size=rows)]
+        return CategoryCodes(codes, self.categories)
+
+
+class ContainsColumn(ChoiceColumn):
+    __slots__ = ()
+    values_key = "custom_values"
+
+
+class CustomColumn(ChoiceColumn):
+    __slots__ = ()
+    values_key = "custom_examples"
+    empty_value = "No Custom Value"
+
+
+class DateColumn(ColumnGenerator):
+    # datetime64[D] offsets from the start date, end date included; with
+    # "timestamp", datetime64[s] up to end_date 23:59:59
+    __slots__ = ("start", "span")
+
+    def __init__(self, col):
+        super().__init__(col)
+        self.start, self.span = date_span(col.get("start_date"), col.get("end_date"))
+        if col.get("timestamp"):
+            self.start = self.start.astype("datetime64[s]")
+            self.span *= 86400
+
+    def values(self, rows, rng, start):
+        return self.start + rng.integers(0, self.span, size=rows)
+
+
+class AlphanumericColumn(ColumnGenerator):
+    __slots__ = ()
+
+    def values(self, rows, rng, start):
+        return bothify("??##", rows, rng)
+
+
+class UniqueColumn(ColumnGenerator):
+    # Keyed on the table seed and the column name, not the chunk, so keys never
+    # repeat anywhere in the table. Key columns are never null.
+    __slots__ = ("template",)
+
+    def __init__(self, col):
+        super().__init__(col)
+        self.template = col.get("template") or DEFAULT_KEY_TEMPLATE
+
+    def generate(self, rows, start, seed, chunk_index, data=None):
+        return self.keys(np.arange(start, start + rows, dtype=np.uint64), seed)
+
+    def keys(self, indexes, seed):
+        # Keys at the given row numbers, computed directly from the row numbers
+        return template_keys(self.template, indexes, seed, self.stream)
+
+
+class ForeignKeyColumn(ColumnGenerator):
+    # Samples parent row numbers and computes the parent's keys for them, so the
+    # parent table is never materialized or looked up row by row.
+    # col["ref"] is filled in by link_foreign_keys.
+    __slots__ = ("parent_rows", "parent_seed", "parent_key", "skew", "fanout_permutation")
+
+    def __init__(self, col):
+        super().__init__(col)
+        ref = col["ref"]
+        self.parent_rows = ref["rows"]
+        self.parent_seed = ref["seed"]
+        self.parent_key = COLUMN_TYPES[ref["column"]["dtype"]](ref["column"])
+        self.skew = None
+        self.fanout_permutation = None
+        if col.get("fanout") == "skewed":
+            self.skew = float(col.get("skew", 1.0))
+            # Spreads the most referenced parents over the table instead of its first rows
+            fanout_stream = zlib.crc32(f"fanout:{self.name}".encode())
+            self.fanout_permutation = key_permutation(self.parent_rows, self.parent_seed, fanout_stream)
+
+    def values(self, rows, rng, start):
+        if self.skew is not None:
+            indexes = self.fanout_permutation(skewed_indexes(rng, rows, self.parent_rows, self.skew))
+        else:
+            indexes = rng.integers(0, self.parent_rows, size=rows).astype(np.uint64)
+        return self.parent_key.keys(indexes, self.parent_seed)
+
+
+class ExpressionColumn(ColumnGenerator):
+    # Derived from other columns of the same rows, evaluated on whole columns
+    # after them (see expressions.py)
+    __slots__ = ("expression",)
+
+    def __init__(self, col):
+        super().__init__(col)
+        self.expression = Expression(col.get("expression") or "")
+
+    def generate(self, rows, start, seed, chunk_index, data=None):
+        rng = self.rng(seed, chunk_index)
+        return apply_nulls(self.expression.evaluate(data, rows, rng), self.null_chance, rng)
+
+
+COLUMN_TYPES = {
+    "index": IndexColumn,
+    "name": NameColumn,
+    "number": NumberColumn,
+    "float": FloatColumn,
+    "contains": ContainsColumn,
+    "custom": CustomColumn,
+    "date": DateColumn,
+    "alphanumeric": AlphanumericColumn,
+    "city": CityColumn,
+    "email": EmailColumn,
+    "unique": UniqueColumn,
+    "foreign_key": ForeignKeyColumn,
+    "expression": ExpressionColumn,
+}
+
+
+def expression_dependencies(columns):
+    # Maps each expression column to the column names its expression uses
+    names = {col["name"] for col in columns}
+    dependencies = {}
+    for col in columns:
+        if col["dtype"] != "expression":
+            continue
+        used = Expression(col.get("expression") or "").names
+        unknown = sorted(used - names)
+        if unknown:
+            raise ValueError(f"Expression of column '{col['name']}' uses unknown column '{unknown[0]}'.")
+        dependencies[col["name"]] = used
+    return dependencies
+
+
+def column_dependencies(columns):
+    # Every column an expression column depends on, directly or through other
+    # expression columns
+    dependencies = expression_dependencies(columns)
+    resolved = {}
+    for name in evaluation_order(dependencies):
+        resolved[name] = set()
+        for used in dependencies[name]:
+            resolved[name] |= {used} | resolved.get(used, set())
+    return resolved
+
+
+def link_foreign_keys(tables):
+    # Returns copies of the table configs where each foreign_key column carries
+    # what it needs from the table it references: row count, seed and key
+    # column. Every table can then be generated, chunked and cached on its own,
+    # in any order.
+    by_name = {table_config.get("name", table_name): table_config for table_name, table_config in tables.items()}
+    linked = {}
+    for table_name, table_config in tables.items():
+        columns = []
+        for col in table_config["columns"]:
+            parent = by_name.get(col.get("ref_table")) if col["dtype"] == "foreign_key" else None
+            parent_col = next((c for c in parent["columns"] if c["name"] == col.get("ref_column")), None) \
+                if parent else None
+            if parent_col is not None and parent_col["dtype"] in KEY_DTYPES:
+                col = dict(col, ref={
+                    "rows": parent["rows"],
+                    "seed": parent.get("seed"),
+                    "column": {key: parent_col.get(key) for key in ["name", "dtype", "template"]},
+                })
+            columns.append(col)
+        linked[table_name] = dict(table_config, columns=columns)
+    return linked
+
+
+def check_table_config(table_config):
+    # Raises ValueError describing the first invalid column of a table config
+    for col in table_config["columns"]:
+        if not col.get("nullable") and col["dtype"] == "contains":
+            if not split_custom_values(col.get("custom_values")):
+                raise ValueError(f"Column '{col['name']}' must have valid values or be nullable.")
+        if not col.get("nullable") and col["dtype"] == "custom":
+            if not split_custom_values(col.get("custom_examples")):
+                raise ValueError(f"Column '{col['name']}' must have valid examples.")
+        if col["dtype"] in ["number", "float"]:
+            if col["max"] < col["min"]:
+                raise ValueError(f"Max value for column '{col['name']}' cannot be less than Min value.")
+        if col["dtype"] == "unique":
+            check_key_capacity(col.get("template") or DEFAULT_KEY_TEMPLATE, table_config["rows"])
+        if col["dtype"] == "foreign_key":
+            if not col.get("ref"):
+                raise ValueError(f"Column '{col['name']}' must reference an index or unique column of a table.")
+            if col["ref"]["seed"] is None:
+                raise ValueError(f"Table '{col['ref_table']}' referenced by column '{col['name']}' needs a seed.")
+            if col["ref"]["rows"] < 1:
+                raise ValueError(f"Table '{col['ref_table']}' referenced by column '{col['name']}' has no rows.")
+        if col["dtype"] == "date":
+            if col.get("end_date") and col.get("start_date") and \
+                    to_datetime64(col["end_date"], None) < to_datetime64(col["start_date"], None):
+                raise ValueError(f"End Date for column '{col['name']}' cannot be earlier than Start Date.")
+    evaluation_order(expression_dependencies(table_config["columns"]))
+    check_expressions(table_config)
+
+
+def check_expressions(table_config):
+    # Expressions are only parsed above, so type errors (e.g. -x on text, or a
+    # date plus a number) would only appear during generation. Each expression
+    # is evaluated on a few sample rows, once as generated and once with every
+    # nullable column missing, and any failure is raised as a ValueError.
+    columns = [col for col in table_config["columns"] if col["dtype"] in COLUMN_TYPES]
+    if not any(col["dtype"] == "expression" for col in columns):
+        return
+    plan = TablePlan(COLUMN_TYPES[col["dtype"]](col) for col in columns)
+    rows = max(1, min(table_config["rows"], EXPRESSION_SAMPLE_ROWS))
+    for missing in [False, True]:
+        rng = np.random.default_rng(EXPRESSION_SAMPLE_SEED)
+        data = {}
+        for column in plan.order:
+            try:
+                values = column.generate(rows, 0, EXPRESSION_SAMPLE_SEED, 0, data)
+            except Exception as error:
+                if not isinstance(column, ExpressionColumn):
+                    raise
+                raise ValueError(f"Expression for column '{column.name}' cannot be evaluated: {error}")
+            nullable = column.null_chance > 0 and not isinstance(column, UniqueColumn)
+            data[column.name] = apply_nulls(values, 1.0, rng) if missing and nullable else values
+
+
+def apply_nulls(values, null_chance, rng):
+    # One boolean mask per column, stored as the missing-value mask of a pandas
+    # nullable array, so numbers keep their dtype (Int64, Float64, boolean) and
+    # strings become "string" instead of object. Done even when no row is null
+    # so every chunk of a table has the same dtype.
+    if null_chance <= 0:
+        return values
+    mask = rng.random(len(values)) < null_chance
+    if isinstance(values, CategoryCodes):
+        codes = values.codes.copy()
+        codes[mask] = -1
+        return CategoryCodes(codes, values.categories)
+    if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+        values[mask] = np.datetime64("NaT")
+        return values
+    import pandas as pd  # masked arrays, only for tables with nullable columns
+    if isinstance(values, pd.api.extensions.ExtensionArray):
+        # Already nullable (e.g. an expression over nullable columns)
+        values = values.copy()
+        values[mask] = None
+        return values
+    if values.dtype.kind in "iu":
+        return pd.arrays.IntegerArray(values.astype(np.int64), mask)
+    if values.dtype.kind == "f":
+        return pd.arrays.FloatingArray(values.astype(np.float64), mask)
+    if values.dtype.kind == "b":
+        return pd.arrays.BooleanArray(values, mask)
+    values = values.astype(object)
+    values[mask] = None
+    return pd.array(values, dtype="string")
+
+
+# ==============================
+# Main Data Generation Functions
+# ==============================
+class TablePlan:
+    # A validated table config compiled into column generators, built once per
+    # config and reused for every chunk and rerun. Expression columns are
+    # generated last, each after the expression columns it uses.
+    __slots__ = ("columns", "order")
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        by_name = {column.name: column for column in self.columns}
+        dependencies = {column.name: column.expression.names for column in self.columns
+                        if isinstance(column, ExpressionColumn)}
+        self.order = tuple([column for column in self.columns if column.name not in dependencies] +
+                           [by_name[name] for name in evaluation_order(dependencies)])
+
+    def generate_columns(self, start, stop, seed=None, chunk_index=0):
+        # The chunk as a dict of columns (see column_chunks.py)
+        data = {}
+        for column in self.order:
+            data[column.name] = column.generate(stop - start, start, seed, chunk_index, data)
+        return {column.name: data[column.name] for column in self.columns}
+
+    def generate_chunk(self, start, stop, seed=None, chunk_index=0):
+        return chunk_frame(self.generate_columns(start, stop, seed, chunk_index))
+
+
+# Compiled plans by config hash, bounded by count (a plan is a few small objects)
+PLAN_CACHE_SIZE = 256
+_plans = MemoryLRU(PLAN_CACHE_SIZE, lambda plan: 1)
+
+
+def plan_key(table_config):
+    # Only the columns and the row count (checked against key capacity) matter
+    config = json.dumps(table_config["columns"], sort_keys=True, default=str)
+    return hashlib.sha1(config.encode()).hexdigest(), table_config["rows"]
+
+
+def compile_table_config(table_config):
+    # Raises ValueError like check_table_config when the config is invalid
+    key = plan_key(table_config)
+    plan = _plans.get(key)
+    if plan is None:
+        check_table_config(table_config)
+        plan = _plans.put(key, TablePlan(COLUMN_TYPES[col["dtype"]](col) for col in table_config["columns"]
+                                         if col["dtype"] in COLUMN_TYPES))
+    return plan
+
+
+def generate_table_chunk(table_config, start, stop, seed=None, chunk_index=0):
+    return compile_table_config(table_config).generate_chunk(start, stop, seed, chunk_index)
+
+
+def iter_synthetic_data_chunks(table_config, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Yields the table as DataFrames of at most chunk_size rows, so only one
+    # chunk is in memory at a time. A missing seed is drawn once for all chunks.
+    plan = compile_table_config(table_config)
+    seed = np.random.SeedSequence(seed).entropy
+    rows = table_config["rows"]
+    for chunk_index, start in enumerate(range(0, rows, chunk_size)):
+        yield plan.generate_chunk(start, min(start + chunk_size, rows), seed, chunk_index)
+
+
+def generate_synthetic_data(table_config, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    import pandas as pd
+    chunks = list(iter_synthetic_data_chunks(table_config, seed, chunk_size))
+    if not chunks:
+        return generate_table_chunk(table_config, 0, 0, seed)
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,275 @@
+import numpy as np
+from datetime import datetime
+from column_chunks import CategoryCodes, chunk_frame
+from columnar_engine import DEFAULT_CHUNK_SIZE, random_dates
+from expressions import Expression, evaluation_order
+from faker_pools import DEFAULT_LOCALE, sample
+from pattern_kernel import bothify, numerify
+from unique_keys import unique_numbers, unique_template_keys
+
+# Domain feature options
+retail_features = [
+    "Product_ID", "Product_Name", "Product_Category", "Product_Subcategory", "Brand",
+    "Supplier_ID", "Supplier_Name", "Store_ID", "Store_Name", "Store_Location", "Customer_ID",
+    "Customer_Name", "Customer_Age", "Customer_Gender", "Customer_Segment", "Transaction_ID",
+    "Transaction_Date", "Quantity_Sold", "Price", "Revenue"]
+
+hr_features = [
+    'EmployeeID', 'Name', 'Age', 'Gender', 'MaritalStatus', 'Department', 'JobTitle', 'ManagerID',
+    'HireDate', 'YearsInCompany', 'YearsInCurrentRole', 'PreviousCompanyExperience', 'EducationLevel',
+    'Salary', 'WorkLocation']
+
+supply_chain_features = ["Order_ID","Customer_ID","Product_ID","Supplier_ID","Warehouse_ID","Shipping_Method","Transporter_Name",
+"Shipment_ID","Destination_Country","Destination_City","Source_Country","Source_City","Product_Category","Product_Subcategory",
+"Order_Channel","Payment_Method","Shipping_Priority","Route_ID","Carrier_ID","Packaging_Type",
+"Order_Status","Shipment_Status",
+"Delivery_Type",  # E.g., Express, Standard
+"Return_Status","Container_Type",  # E.g., Small, Medium, Large
+"SKU",  # Stock Keeping Unit,
+"Distribution_Center_ID"]
+
+
+# Feature selection based on domain
+def domain_features(choose_domain):
+    if choose_domain == 'Retail':
+        return retail_features
+    elif choose_domain == 'HR':
+        return hr_features
+    elif choose_domain == 'Supply_Chain':
+        return supply_chain_features
+    return []
+
+
+# Predefined lists for domain-specific data
+products = ['Product1', 'Product2', 'Product3']
+Product_Categories = ['PC1', 'PC2', 'PC3', 'PC4', 'PC5']
+Product_Subcategories = ['PSC1', 'PSC2', 'PSC3', 'PSC4', 'PSC5']
+Brands = ['Brand1', 'Brand2', 'Brand3', 'Brand4', 'Brand5']
+Supplier_names = ['Supplier1', 'Supplier2', 'Supplier3', 'Supplier4', 'Supplier5']
+Store_Names = ['Store1', 'Store2', 'Store3', 'Store4', 'Store5']
+Customer_Segments = ['CS1', 'CS2', 'CS3']
+
+# HR domain data
+Department = ['BA', 'BI', 'Ops', 'DE', 'DS', 'Finance', 'DevOps']
+JobTitle = ['Analyst', 'Consultant', 'Senior Consultant', 'Manager', 'Lead Manager', 'DoD']
+WorkLocation = ['Bangalore', 'Noida', 'Chennai', 'Hyderabad', 'Kochi']
+hire_date = datetime.strptime("2002-01-01", "%Y-%m-%d")
+exit_date = datetime.strptime("2024-12-31", "%Y-%m-%d")
+
+# Supply_chain data
+Shipping_Method = ['Air','Ocean','Road']
+Transporter_Name = ['TP1','TP2','TP3','TP4','TP5']
+Source_Country = ['USA','Canada','Germany','India','Japan','Australia','Brazil','China','SA','UK']
+Source_city = ['NY','Toronto','Berlin','Mumbai','Tokyo','Sydney','Paulo','Shanghai','Johannesburg','London']
+Destination_Country = ['France','Italy','Mexico','Russia','Spain','UAE','SK','Singapore','Argentina','Netherlands']
+Destination_city = ['Paris','Rome','Mexico','Moscow','Madrid','Dubai','Seoul','Singapore','Buenos','Amsterdam']
+Order_Channel = ['Third-party Logistics Partner','Corporate Portal']
+Payment_Method = ['Online','offline']
+Packaging_types = ["Box","Pallet","Drum","Plastic Wrap","Bubble Mailer"]
+Delivery_types = ["Standard","Express","Same-Day"]
+Container_Type = ['Small', 'Medium', 'Large']
+
+# Retail data generation
+start_date = datetime.strptime("2022-01-01", "%Y-%m-%d")
+end_date = datetime.strptime("2024-12-31", "%Y-%m-%d")
+
+
+# ==============================
+# Vectorized Column Helpers
+# ==============================
+def choice(values, nrows, rng):
+    # Fixed lists are sampled as integer codes and kept as a Categorical, so
+    # each row stores a small code instead of a Python string
+    codes = rng.integers(0, len(values), size=nrows, dtype=np.int8 if len(values) < 128 else np.int32)
+    return CategoryCodes(codes, values)
+
+
+def integers(low, high, nrows, rng):
+    # Inclusive on both ends, like random.randint / faker.random_int
+    return rng.integers(low, high, size=nrows, endpoint=True)
+
+
+def prefixed_integers(prefix, low, high, nrows, rng):
+    return np.char.add(prefix, integers(low, high, nrows, rng).astype(str)).astype(object)
+
+
+def dates(start, end, nrows, rng):
+    return random_dates(rng, nrows, start, end)
+
+
+class UniqueKeyColumn:
+    # Key column built from the row numbers and the table seed instead of a
+    # per-chunk stream, so no key repeats across rows or chunks. Either fills a
+    # bothify template or numbers the rows 1..N in shuffled order after a prefix.
+    def __init__(self, template=None, prefix=None):
+        self.template = template
+        self.prefix = prefix
+
+    def generate(self, start, stop, total_rows, seed, stream):
+        if self.template is not None:
+            return unique_template_keys(self.template, start, stop, seed, stream)
+        numbers = unique_numbers(start, stop, total_rows, seed, stream)
+        return np.char.add(self.prefix, numbers.astype(str)).astype(object)
+
+
+class DerivedColumn:
+    # Column computed from other columns of the same rows (see expressions.py);
+    # the columns it uses are generated even when they are not selected
+    def __init__(self, expression):
+        self.expression = Expression(expression)
+
+
+# ==============================
+# Domain Column Generators
+# ==============================
+# Each column is built on its own by a function of (nrows, rng, locale),
+# so only the requested columns are ever materialized.
+retail_columns = {
+    "Product_ID": lambda nrows, rng, locale: numerify('#######', nrows, rng),
+    "Product_Name": lambda nrows, rng, locale: choice(products, nrows, rng),
+    "Product_Category": lambda nrows, rng, locale: choice(Product_Categories, nrows, rng),
+    "Product_Subcategory": lambda nrows, rng, locale: choice(Product_Subcategories, nrows, rng),
+    "Brand": lambda nrows, rng, locale: choice(Brands, nrows, rng),
+    "Supplier_ID": lambda nrows, rng, locale: bothify('#?#?', nrows, rng),
+    "Supplier_Name": lambda nrows, rng, locale: choice(Supplier_names, nrows, rng),
+    "Store_ID": lambda nrows, rng, locale: bothify('#?#?', nrows, rng),
+    "Store_Name": lambda nrows, rng, locale: choice(Store_Names, nrows, rng),
+    "Store_Location": lambda nrows, rng, locale: sample("city", nrows, rng, locale),
+    "Customer_ID": lambda nrows, rng, locale: bothify('#######???', nrows, rng),
+    "Customer_Name": lambda nrows, rng, locale: sample("name", nrows, rng, locale),
+    "Customer_Age": lambda nrows, rng, locale: integers(18, 80, nrows, rng),
+    "Customer_Gender": lambda nrows, rng, locale: choice(['M', 'F'], nrows, rng),
+    "Customer_Segment": lambda nrows, rng, locale: choice(Customer_Segments, nrows, rng),
+    "Transaction_ID": UniqueKeyColumn(template='???####'),
+    "Transaction_Date": lambda nrows, rng, locale: dates(start_date, end_date, nrows, rng),
+    "Quantity_Sold": lambda nrows, rng, locale: integers(2, 100, nrows, rng),
+    "Price": lambda nrows, rng, locale: integers(100, 1000, nrows, rng),
+    "Revenue": DerivedColumn("Quantity_Sold * Price")
+}
+
+hr_columns = {
+    'EmployeeID': UniqueKeyColumn(prefix="EMP"),
+    'Name': lambda nrows, rng, locale: sample("name", nrows, rng, locale),
+    "Age": lambda nrows, rng, locale: integers(20, 60, nrows, rng),
+    "Gender": lambda nrows, rng, locale: choice(['M', 'F'], nrows, rng),
+    "MaritalStatus": lambda nrows, rng, locale: choice(['Y', 'N'], nrows, rng),
+    "Department": lambda nrows, rng, locale: choice(Department, nrows, rng),
+    "JobTitle": lambda nrows, rng, locale: choice(JobTitle, nrows, rng),
+    "ManagerID": lambda nrows, rng, locale: prefixed_integers("EMP", 1, 31, nrows, rng),
+    "HireDate": lambda nrows, rng, locale: dates(hire_date, exit_date, nrows, rng),
+    "YearsInCompany": lambda nrows, rng, locale: integers(1, 10, nrows, rng),
+    "YearsInCurrentRole": DerivedColumn("minimum(randint(1, 5), YearsInCompany)"),
+    "PreviousCompanyExperience": lambda nrows, rng, locale: integers(1, 5, nrows, rng),
+    "EducationLevel": lambda nrows, rng, locale: prefixed_integers("LVL", 1, 5, nrows, rng),
+    "Salary": lambda nrows, rng, locale: integers(3, 100, nrows, rng),
+    "WorkLocation": lambda nrows, rng, locale: choice(WorkLocation, nrows, rng)
+}
+
+supply_chain_columns = {
+    "Order_ID": UniqueKeyColumn(template="########"),
+    "Customer_ID": lambda nrows, rng, locale: bothify("#?#?#?#?", nrows, rng),
+    "Product_ID": lambda nrows, rng, locale: bothify("#?#?#?#?", nrows, rng),
+    "Supplier_ID": lambda nrows, rng, locale: bothify("#?#?#?#?", nrows, rng),
+    "Warehouse_ID": lambda nrows, rng, locale: bothify("#?#?#?#?", nrows, rng),
+    "Shipping_Method": lambda nrows, rng, locale: choice(Shipping_Method, nrows, rng),
+    "Transporter_Name": lambda nrows, rng, locale: choice(Transporter_Name, nrows, rng),
+    "Shipment_ID": lambda nrows, rng, locale: bothify("#?#?#?#?", nrows, rng),
+    "Destination_Country": lambda nrows, rng, locale: choice(Destination_Country, nrows, rng),
+    "Destination_City": lambda nrows, rng, locale: choice(Destination_city, nrows, rng),
+    "Source_Country": lambda nrows, rng, locale: choice(Source_Country, nrows, rng),
+    "Source_City": lambda nrows, rng, locale: choice(Source_city, nrows, rng),
+    "Product_Category": lambda nrows, rng, locale: choice(Product_Categories, nrows, rng),
+    "Product_Subcategory": lambda nrows, rng, locale: choice(Product_Subcategories, nrows, rng),
+    "Order_Channel": lambda nrows, rng, locale: choice(Order_Channel, nrows, rng),
+    "Payment_Method": lambda nrows, rng, locale: choice(Payment_Method, nrows, rng),
+    "Shipping_Priority": lambda nrows, rng, locale: choice(['Y','N'], nrows, rng),
+    "Route_ID": lambda nrows, rng, locale: bothify("000#?#?#?#?", nrows, rng),
+    "Carrier_ID": lambda nrows, rng, locale: bothify("CA?#?#?", nrows, rng),
+    "Packaging_Type": lambda nrows, rng, locale: choice(Packaging_types, nrows, rng),
+    "Order_Status": lambda nrows, rng, locale: choice(['Y','N'], nrows, rng),
+    "Shipment_Status": lambda nrows, rng, locale: choice(['Y','N'], nrows, rng),
+    "Delivery_Type": lambda nrows, rng, locale: choice(Delivery_types, nrows, rng),
+    "Return_Status": lambda nrows, rng, locale: choice(['Y','N'], nrows, rng),
+    "Container_Type": lambda nrows, rng, locale: choice(Container_Type, nrows, rng),
+    "SKU": lambda nrows, rng, locale: bothify("SKU#?#?#?#?", nrows, rng),
+    "Distribution_Center_ID": lambda nrows, rng, locale: numerify("#######", nrows, rng)
+}
+
+
+def column_rng(seed, position, chunk_index=0):
+    # One independent stream per (chunk, column position), so a column's values
+    # do not depend on which other columns were selected
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index, position)))
+
+
+def generate_columns(domain_columns, nrows, columns=None, seed=None, locale=DEFAULT_LOCALE, chunk_index=0,
+                     start=0, total_rows=None):
+    # start and total_rows place this chunk within the whole table for key columns
+    selected = list(domain_columns) if not columns else columns
+    unknown = [name for name in selected if name not in domain_columns]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}")
+    total_rows = start + nrows if total_rows is None else total_rows
+    positions = {name: position for position, name in enumerate(domain_columns)}
+
+    # Selected columns plus everything the selected derived columns use
+    dependencies = {}
+    pending = list(selected)
+    while pending:
+        name = pending.pop()
+        if isinstance(domain_columns[name], DerivedColumn) and name not in dependencies:
+            dependencies[name] = domain_columns[name].expression.names
+            pending.extend(dependencies[name])
+    needed = set(selected).union(*dependencies.values())
+
+    data = {}
+    for name in domain_columns:
+        generator = domain_columns[name]
+        if name not in needed or isinstance(generator, DerivedColumn):
+            continue
+        if isinstance(generator, UniqueKeyColumn):
+            data[name] = generator.generate(start, start + nrows, total_rows, seed, positions[name])
+        else:
+            data[name] = generator(nrows, column_rng(seed, positions[name], chunk_index), locale)
+    for name in evaluation_order(dependencies):
+        rng = column_rng(seed, positions[name], chunk_index)
+        data[name] = domain_columns[name].expression.evaluate(data, nrows, rng)
+    return {name: data[name] for name in selected}
+
+
+# ==============================
+# Domain Data Generators
+# ==============================
+def generate_retail_data(nrows, columns=None, seed=None, locale=DEFAULT_LOCALE):
+    return generate_columns(retail_columns, nrows, columns, seed, locale)
+
+
+# HR data generation
+def generate_hr_data(nrows, columns=None, seed=None, locale=DEFAULT_LOCALE):
+    return generate_columns(hr_columns, nrows, columns, seed, locale)
+
+
+# Supply chain data generation
+def generate_supply_chain_data(nrows, columns=None, seed=None, locale=DEFAULT_LOCALE):
+    return generate_columns(supply_chain_columns, nrows, columns, seed, locale)
+
+
+def domain_columns(choose_domain):
+    if choose_domain == 'Retail':
+        return retail_columns
+    elif choose_domain == 'HR':
+        return hr_columns
+    elif choose_domain == 'Supply_Chain':
+        return supply_chain_columns
+    raise ValueError(f"Unknown domain: {choose_domain}")
+
+
+def iter_domain_chunks(choose_domain, nrows, columns=None, seed=None, locale=DEFAULT_LOCALE,
+                       chunk_size=DEFAULT_CHUNK_SIZE):
+    # Yields the domain table as DataFrames of at most chunk_size rows. A missing
+    # seed is drawn once, so key columns stay unique across chunks.
+    seed = np.random.SeedSequence(seed).entropy
+    for chunk_index, start in enumerate(range(0, nrows, chunk_size)):
+        chunk_rows = min(chunk_size, nrows - start)
+        yield chunk_frame(generate_columns(domain_columns(choose_domain), chunk_rows, columns, seed, locale,
+                                            chunk_index, start, nrows))
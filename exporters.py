@@ -0,0 +1,239 @@
+import csv
+import io
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+import numpy as np
+from column_chunks import CategoryCodes, chunk_frame
+
+# Exports smaller than this stay in memory, larger ones spill to a temp file
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+
+def iter_frame_chunks(df, chunk_size):
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def csv_values(values):
+    # A column chunk's values as the csv module should write them to match
+    # DataFrame.to_csv, or None when only pandas formats them the same way
+    # (nullable arrays, timestamps, timedeltas)
+    if isinstance(values, CategoryCodes):
+        return values.to_text()
+    if not isinstance(values, np.ndarray) or values.dtype.kind not in "iubfOUM":
+        return None
+    if values.dtype.kind == "f":
+        text = values.astype(object)
+        text[np.isnan(values)] = ""
+        return text
+    if values.dtype.kind == "M":
+        if values.dtype != np.dtype("datetime64[D]"):
+            return None
+        text = values.astype(str).astype(object)
+        text[np.isnat(values)] = ""
+        return text
+    return values
+
+
+def write_csv(chunks, file):
+    # Writes chunks to a binary file one at a time, header first. A chunk is a
+    # DataFrame or a dict of columns (see column_chunks.py); dicts are written
+    # with the csv module, as to_csv would, unless a column needs pandas.
+    text_file = io.TextIOWrapper(file, encoding="utf-8", newline="")
+    header = True
+    for chunk in chunks:
+        if isinstance(chunk, dict):
+            columns = [csv_values(values) for values in chunk.values()]
+            if all(column is not None for column in columns):
+                writer = csv.writer(text_file, lineterminator=os.linesep)
+                if header:
+                    writer.writerow(chunk)
+                writer.writerows(zip(*[column.tolist() for column in columns]))
+                header = False
+                continue
+            chunk = chunk_frame(chunk)
+        chunk.to_csv(text_file, index=False, header=header)
+        header = False
+    text_file.flush()
+    text_file.detach()
+
+
+def arrow_tables(chunks):
+    # Converts DataFrame chunks to Arrow tables that all share the first chunk's
+    # schema (typed dates, ints and dictionary-encoded categoricals)
+    import pyarrow as pa  # optional dependency, only needed for Parquet/Arrow output
+    schema = None
+    for chunk in chunks:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if schema is None:
+            schema = table.schema
+        elif table.schema != schema:
+            table = table.cast(schema)
+        yield table
+
+
+def write_parquet(chunks, file):
+    # One Parquet row group per chunk, written as soon as the chunk is ready
+    import pyarrow.parquet as pq
+    writer = None
+    for table in arrow_tables(chunks):
+        if writer is None:
+            writer = pq.ParquetWriter(file, table.schema)
+        writer.write_table(table, row_group_size=table.num_rows)
+    if writer is not None:
+        writer.close()
+
+
+def write_arrow(chunks, file):
+    # Arrow IPC file format, one record batch per chunk
+    import pyarrow as pa
+    writer = None
+    for table in arrow_tables(chunks):
+        if writer is None:
+            writer = pa.ipc.new_file(file, table.schema)
+        writer.write_table(table)
+    if writer is not None:
+        writer.close()
+
+
+# Export format -> (writer, file extension, mime type)
+EXPORT_FORMATS = {
+    "CSV": (write_csv, ".csv", "text/csv"),
+    "Parquet": (write_parquet, ".parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": (write_arrow, ".arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+class DeflateFile(io.RawIOBase):
+    # Write-only file that deflates everything written to it into target,
+    # keeping the CRC-32 and sizes a ZIP entry needs
+    def __init__(self, target):
+        self.target = target
+        self.compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        self.crc = 0
+        self.size = 0
+        self.compressed_size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = memoryview(data).cast("B")
+        self.crc = zlib.crc32(data, self.crc)
+        self.size += len(data)
+        self._write_compressed(self.compressor.compress(data))
+        return len(data)
+
+    def tell(self):
+        return self.size
+
+    def finish(self):
+        self._write_compressed(self.compressor.flush())
+
+    def _write_compressed(self, data):
+        self.target.write(data)
+        self.compressed_size += len(data)
+
+
+def deflate_member(writer, chunks):
+    # Runs writer(chunks, file) through a DeflateFile into a spooled temp file
+    file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    member = DeflateFile(file)
+    writer(chunks, member)
+    member.finish()
+    file.seek(0)
+    return file, member
+
+
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_VERSION = 45  # ZIP64
+ZIP_UTF8_FLAG = 0x800
+ZIP_DEFLATED = 8
+
+
+def dos_date_time(timestamp):
+    year, month, day, hour, minute, second = time.localtime(timestamp)[:6]
+    return ((year - 1980) << 9) | (month << 5) | day, (hour << 11) | (minute << 5) | (second // 2)
+
+
+def zip64_extra(*values):
+    # ZIP64 extra field holding the values that overflow their 32-bit header fields
+    values = [value for value in values if value >= ZIP64_LIMIT]
+    if not values:
+        return b""
+    return struct.pack(f"<HH{len(values)}Q", 0x0001, 8 * len(values), *values)
+
+
+def write_zip(tables, file, writer=write_csv, workers=None):
+    # tables maps a file name inside the archive to an iterable of DataFrame chunks.
+    # Tables are written and deflated in parallel threads (zlib and most of the
+    # writers release the GIL), each into its own spooled temp file, then copied
+    # into the archive in order. Offsets count from the start of file, as
+    # zipfile's do, so the archive may follow other data.
+    from concurrent.futures import ThreadPoolExecutor  # only ZIP exports use threads
+    workers = workers or max(1, min(len(tables), os.cpu_count() or 1))
+    zip_date, zip_time = dos_date_time(time.time())
+    entries = []
+    offset = file.tell()
+    with ThreadPoolExecutor(workers) as executor:
+        futures = [(file_name, executor.submit(deflate_member, writer, chunks)) for file_name, chunks in tables.items()]
+        for file_name, future in futures:
+            data, member = future.result()
+            name = file_name.encode("utf-8")
+            # The local header's ZIP64 field always holds both sizes
+            zip64 = max(member.size, member.compressed_size) >= ZIP64_LIMIT
+            extra = struct.pack("<HHQQ", 0x0001, 16, member.size, member.compressed_size) if zip64 else b""
+            header_sizes = (ZIP64_LIMIT, ZIP64_LIMIT) if zip64 else (member.compressed_size, member.size)
+            file.write(struct.pack("<IHHHHHIIIHH", 0x04034B50, ZIP_VERSION, ZIP_UTF8_FLAG, ZIP_DEFLATED,
+                                   zip_time, zip_date, member.crc, *header_sizes, len(name), len(extra)))
+            file.write(name + extra)
+            shutil.copyfileobj(data, file)
+            data.close()
+            entries.append((name, member, offset))
+            offset += 30 + len(name) + len(extra) + member.compressed_size
+
+    directory_offset = offset
+    for name, member, header_offset in entries:
+        extra = zip64_extra(member.size, member.compressed_size, header_offset)
+        file.write(struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, ZIP_VERSION, ZIP_VERSION, ZIP_UTF8_FLAG,
+                               ZIP_DEFLATED, zip_time, zip_date, member.crc,
+                               min(member.compressed_size, ZIP64_LIMIT), min(member.size, ZIP64_LIMIT),
+                               len(name), len(extra), 0, 0, 0, 0o100644 << 16, min(header_offset, ZIP64_LIMIT)))
+        file.write(name + extra)
+        offset += 46 + len(name) + len(extra)
+
+    directory_size = offset - directory_offset
+    count = len(entries)
+    if count >= 0xFFFF or directory_size >= ZIP64_LIMIT or directory_offset >= ZIP64_LIMIT:
+        # ZIP64 end of central directory record and locator
+        file.write(struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, ZIP_VERSION, ZIP_VERSION, 0, 0,
+                               count, count, directory_size, directory_offset))
+        file.write(struct.pack("<IIQI", 0x07064B50, 0, offset, 1))
+    file.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+                           min(directory_size, ZIP64_LIMIT), min(directory_offset, ZIP64_LIMIT), 0))
+
+
+class DownloadFile(io.FileIO):
+    # A finished export for st.download_button, which takes a file object and
+    # reads it with a single read() (io.FileIO, not SpooledTemporaryFile). It
+    # closes itself once read to the end, so no handle outlives the download.
+    def read(self, size=-1):
+        data = super().read(size)
+        if size is None or size < 0:
+            self.close()
+        return data
+
+
+def download_export(writer, data):
+    # Runs writer(data, file) into an unnamed temporary file on disk and
+    # returns it rewound as a DownloadFile; the file is deleted once closed
+    with tempfile.TemporaryFile() as file:
+        writer(data, file)
+        file.flush()
+        download = DownloadFile(os.dup(file.fileno()), "r")
+    download.seek(0)
+    return download
@@ -0,0 +1,310 @@
+import ast
+import graphlib
+import numpy as np
+from column_chunks import CategoryCodes
+
+# Largest exponent allowed when both sides of ** are number literals; a power
+# of constants is computed with Python integers, and 9 ** 9 ** 9 never finishes
+MAX_CONSTANT_EXPONENT = 64
+# Integer constants, and constants computed from them, must fit a column's int64
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+# ==============================
+# Expression Functions
+# ==============================
+# Every function works on whole columns or scalars at once. Numeric and bool
+# columns are NumPy arrays, so arithmetic on them never imports pandas; text,
+# date, categorical and nullable columns are pandas Series (see operand).
+def is_series(value):
+    return not isinstance(value, (np.ndarray, np.generic, int, float, str))
+
+
+def operand(values):
+    # A generated column as an expression operand
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iufb":
+        return values
+    import pandas as pd  # text, dates, categoricals and nullable columns
+    return pd.Series(values.to_pandas() if isinstance(values, CategoryCodes) else values)
+
+
+def as_series(value):
+    if not isinstance(value, np.ndarray):
+        return value
+    import pandas as pd
+    return pd.Series(value)
+
+
+def float_values(value):
+    # Values as floats (NaN for missing), for overflow checks
+    if isinstance(value, np.ndarray) or not is_series(value):
+        return np.asarray(value, dtype=np.float64)
+    return value.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def power(a, b):
+    # NumPy wraps integer powers that overflow int64 (q ** 10 ** 10); those
+    # raise instead
+    result = a ** b
+    if getattr(result, "dtype", None) is not None and result.dtype.kind in "iu":
+        with np.errstate(all="ignore"):
+            floats = np.abs(float_values(a)) ** float_values(b)
+        if np.any(floats > INT64_MAX):
+            raise OverflowError("integer power is too large for a 64-bit integer")
+    return result
+
+
+def check_constant(value):
+    if isinstance(value, int) and not isinstance(value, bool) and not INT64_MIN <= value <= INT64_MAX:
+        raise OverflowError(f"constant {value} is too large for a 64-bit integer")
+    return value
+
+
+def check_result_dtype(dtype):
+    # Results must be numbers, booleans, dates, text or categoricals; anything
+    # else (e.g. object columns mixing numbers and text) breaks Parquet/Arrow
+    if dtype.kind in "iufbM":
+        return
+    import pandas as pd
+    if not isinstance(dtype, (pd.StringDtype, pd.CategoricalDtype)):
+        raise TypeError(f"the result has dtype {dtype}, not numbers, booleans, dates or text")
+
+
+def as_text(value):
+    # Columns used as text (categoricals, numbers, ...) become a "string" Series
+    if isinstance(value, np.ndarray) or is_series(value):
+        return as_series(value).astype("string")
+    return value if isinstance(value, str) else str(value)
+
+
+def email_address(name, domain="domain.com"):
+    # Same shape as the pooled emails: first.last@domain
+    words = as_text(name).str.lower().str.replace(".", "", regex=False).str.split()
+    return word(words, 0) + "." + word(words, -1) + "@" + domain
+
+
+def word(words, position):
+    # One word of each row's split text, kept as "string" rather than object
+    return words.str[position].astype("string")
+
+
+def where(condition, a, b):
+    # A missing condition (a comparison with a null value) picks b, like False.
+    # Column values keep their dtype (and nulls) through Series.where/mask;
+    # categoricals become text so either side may hold other values.
+    if not isinstance(condition, np.ndarray) and not is_series(condition):
+        return a if condition else b
+    if not any(is_series(value) or isinstance(value, str) for value in (condition, a, b)):
+        return np.where(condition, a, b)
+    import pandas as pd
+    condition = as_series(condition).fillna(False).astype(bool)
+    a, b = [as_text(value) if is_series(value) and isinstance(value.dtype, pd.CategoricalDtype)
+            else as_series(value) for value in (a, b)]
+    if isinstance(a, pd.Series):
+        return a.where(condition, b)
+    if isinstance(b, pd.Series):
+        return b.mask(condition, a)
+    return pd.Series(np.where(condition, a, b))
+
+
+FUNCTIONS = {
+    "abs": lambda ctx, x: abs(x),
+    "round": lambda ctx, x, digits=0: np.round(x, digits),
+    "minimum": lambda ctx, a, b: np.minimum(a, b),
+    "maximum": lambda ctx, a, b: np.maximum(a, b),
+    "where": lambda ctx, condition, a, b: where(condition, a, b),
+    "randint": lambda ctx, low, high: ctx.rng.integers(low, high, size=ctx.rows, endpoint=True),
+    "uniform": lambda ctx, low, high: ctx.rng.uniform(low, high, size=ctx.rows),
+    "text": lambda ctx, x: as_text(x),
+    "lower": lambda ctx, x: as_text(x).str.lower(),
+    "upper": lambda ctx, x: as_text(x).str.upper(),
+    "strip": lambda ctx, x: as_text(x).str.strip(),
+    "replace": lambda ctx, x, old, new: as_text(x).str.replace(old, new, regex=False),
+    "first_word": lambda ctx, x: word(as_text(x).str.split(), 0),
+    "last_word": lambda ctx, x: word(as_text(x).str.split(), -1),
+    "concat": lambda ctx, *parts: sum_text(parts),
+    "email": lambda ctx, name, domain="domain.com": email_address(name, domain),
+}
+
+BINARY_OPERATORS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.FloorDiv: lambda a, b: a // b,
+    ast.Mod: lambda a, b: a % b,
+    ast.Pow: power,
+    ast.BitAnd: lambda a, b: a & b,
+    ast.BitOr: lambda a, b: a | b,
+}
+# Computed on Series even for NumPy operands: NumPy gives 0 for an integer
+# // or % by zero, pandas gives inf/NaN
+SERIES_OPERATORS = [ast.FloorDiv, ast.Mod]
+
+COMPARE_OPERATORS = {
+    ast.Eq: lambda a, b: a == b,
+    ast.NotEq: lambda a, b: a != b,
+    ast.Lt: lambda a, b: a < b,
+    ast.LtE: lambda a, b: a <= b,
+    ast.Gt: lambda a, b: a > b,
+    ast.GtE: lambda a, b: a >= b,
+}
+
+UNARY_OPERATORS = {
+    ast.USub: lambda a: -a,
+    ast.UAdd: lambda a: +a,
+    ast.Invert: lambda a: ~a,
+}
+
+
+def is_text(value):
+    if isinstance(value, str):
+        return True
+    if not is_series(value):
+        return False
+    import pandas as pd
+    return value.dtype == object or isinstance(value.dtype, (pd.StringDtype, pd.CategoricalDtype))
+
+
+def sum_text(parts):
+    result = ""
+    for part in parts:
+        result = result + as_text(part)
+    return result
+
+
+class EvaluationContext:
+    __slots__ = ("columns", "rows", "rng")
+
+    def __init__(self, columns, rows, rng):
+        self.columns = columns
+        self.rows = rows
+        self.rng = rng
+
+
+# ==============================
+# Expressions
+# ==============================
+class Expression:
+    # A column expression parsed and checked once: + - * / // % **, comparisons,
+    # & | ~, constants and the functions in FUNCTIONS, over other columns of the
+    # same table referred to by name. `+` concatenates when either side is text.
+
+    def __init__(self, text):
+        self.text = text
+        try:
+            self.tree = ast.parse(text.strip(), mode="eval").body
+        except SyntaxError:
+            raise ValueError(f"Invalid expression '{text}'.")
+        self.names = set()
+        self._check(self.tree)
+
+    def _check(self, node):
+        if isinstance(node, ast.Name):
+            self.names.add(node.id)
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float, str, bool)):
+                raise ValueError(f"Unsupported constant in expression '{self.text}'.")
+        elif isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+            self._check(node.left)
+            self._check(node.right)
+            if isinstance(node.op, ast.Pow):
+                self._check_power(node)
+        elif isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            self._check(node.operand)
+        elif isinstance(node, ast.Compare) and all(type(op) in COMPARE_OPERATORS for op in node.ops):
+            for child in [node.left] + node.comparators:
+                self._check(child)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS \
+                and not node.keywords:
+            for arg in node.args:
+                self._check(arg)
+        else:
+            raise ValueError(f"Unsupported syntax in expression '{self.text}': {ast.unparse(node)}")
+
+    def _check_power(self, node):
+        # A power of constants is only allowed between number literals with a
+        # small exponent; with a column on either side it is computed by NumPy
+        if uses_columns(node):
+            return
+        base, exponent = number_literal(node.left), number_literal(node.right)
+        if base is None or exponent is None or abs(exponent) > MAX_CONSTANT_EXPONENT:
+            raise ValueError(f"Powers of constants in expression '{self.text}' need number literals "
+                             f"with an exponent of at most {MAX_CONSTANT_EXPONENT}: {ast.unparse(node)}")
+
+    def evaluate(self, columns, rows, rng):
+        # columns maps names to the already generated columns of this chunk;
+        # rng is only used by randint/uniform
+        # Division by zero gives inf/NaN without warnings, as it does in pandas
+        with np.errstate(all="ignore"):
+            result = self._evaluate(self.tree, EvaluationContext(columns, rows, rng))
+        if isinstance(result, str):
+            result = as_series(np.full(rows, result))
+        elif not isinstance(result, np.ndarray) and not is_series(result):
+            result = np.full(rows, result)
+        check_result_dtype(result.dtype)
+        if isinstance(result, np.ndarray):
+            return result
+        # A NumPy array, or a pandas array for nullable, string and categorical results
+        return result.to_numpy() if isinstance(result.dtype, np.dtype) else result.array
+
+    def _evaluate(self, node, ctx):
+        if isinstance(node, ast.Name):
+            return operand(ctx.columns[node.id])
+        if isinstance(node, ast.Constant):
+            return check_constant(node.value)
+        if isinstance(node, ast.BinOp):
+            left, right = self._evaluate(node.left, ctx), self._evaluate(node.right, ctx)
+            if is_text(left) or is_text(right):
+                # Checked before computing: 'x' * 10 ** 9 would allocate gigabytes
+                if not isinstance(node.op, ast.Add):
+                    raise TypeError(f"text can only be joined with +: {ast.unparse(node)}")
+                return as_text(left) + as_text(right)
+            if type(node.op) in SERIES_OPERATORS:
+                left, right = as_series(left), as_series(right)
+            return check_constant(BINARY_OPERATORS[type(node.op)](left, right))
+        if isinstance(node, ast.UnaryOp):
+            return check_constant(UNARY_OPERATORS[type(node.op)](self._evaluate(node.operand, ctx)))
+        if isinstance(node, ast.Compare):
+            # a < b < c is (a < b) & (b < c), like Python but for whole columns
+            result = None
+            left = self._evaluate(node.left, ctx)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._evaluate(comparator, ctx)
+                step = COMPARE_OPERATORS[type(op)](left, right)
+                result = step if result is None else result & step
+                left = right
+            return result
+        args = [self._evaluate(arg, ctx) for arg in node.args]
+        return FUNCTIONS[node.func.id](ctx, *args)
+
+
+def uses_columns(node):
+    # True when node refers to a column, or calls randint/uniform (a value per row)
+    functions = {id(child.func) for child in ast.walk(node) if isinstance(child, ast.Call)}
+    return any((isinstance(child, ast.Name) and id(child) not in functions) or
+               (isinstance(child, ast.Call) and child.func.id in ["randint", "uniform"])
+               for child in ast.walk(node))
+
+
+def number_literal(node):
+    # The value of a (signed) int or float literal, else None
+    sign = 1
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        sign = -1 if isinstance(node.op, ast.USub) else 1
+        node = node.operand
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return sign * node.value
+    return None
+
+
+def evaluation_order(dependencies):
+    # dependencies maps each derived column to the columns its expression uses.
+    # Returns the derived columns so that each comes after those it depends on.
+    try:
+        order = list(graphlib.TopologicalSorter(dependencies).static_order())
+    except graphlib.CycleError as error:
+        cycle = ", ".join(map(str, dict.fromkeys(error.args[1])))
+        raise ValueError(f"Columns {cycle} depend on each other.")
+    return [name for name in order if name in dependencies]
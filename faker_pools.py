@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+import numpy as np
+from memory_lru import MemoryLRU
+
+DEFAULT_LOCALE = "en_US"
+# Number of distinct values pre-generated per (provider, locale)
+DEFAULT_POOL_SIZE = 5000
+# Pools are seeded so every process builds identical pools
+POOL_SEED = 0
+POOL_MEMORY_LIMIT = 64 * 1024 * 1024
+# Built pools are also saved here, so new processes (CLI runs, pool workers)
+# load them instead of calling Faker again
+POOL_CACHE_DIR = os.environ.get("FAKER_POOL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "faker_pools"))
+
+
+def pool_nbytes(pool):
+    return pool.nbytes + sum(sys.getsizeof(value) for value in pool)
+
+
+_pools = MemoryLRU(POOL_MEMORY_LIMIT, pool_nbytes)
+
+
+def set_pool_memory_limit(max_bytes):
+    _pools.set_max_bytes(max_bytes)
+
+
+def build_pool(provider, locale=DEFAULT_LOCALE, size=DEFAULT_POOL_SIZE):
+    # Calling Faker once per row is the slowest part of generation, so each
+    # provider is called until it has `size` distinct values (or gives up
+    # after 3 * size calls for providers with a small vocabulary).
+    from faker import Faker  # imported on first use; a saved pool never needs it
+    fake = Faker(locale)
+    fake.seed_instance(POOL_SEED)
+    method = getattr(fake, provider)
+    values = {}
+    for _ in range(size * 3):
+        values[method()] = None
+        if len(values) == size:
+            break
+    return np.array(list(values), dtype=object)
+
+
+def pool_cache_path(provider, locale, size):
+    # Faker's version is part of the name: its providers change between releases
+    from importlib.metadata import version  # slow to import, and only needed here
+    return os.path.join(POOL_CACHE_DIR, f"{provider}-{locale}-{size}-{POOL_SEED}-faker{version('faker')}.json")
+
+
+def load_or_build_pool(provider, locale=DEFAULT_LOCALE, size=DEFAULT_POOL_SIZE):
+    path = pool_cache_path(provider, locale, size)
+    try:
+        with open(path, encoding="utf-8") as file:
+            return np.array(json.load(file), dtype=object)
+    except (OSError, ValueError):
+        pass
+    pool = build_pool(provider, locale, size)
+    try:
+        os.makedirs(POOL_CACHE_DIR, exist_ok=True)
+        # Write then rename, so concurrent processes never read a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(pool.tolist(), file)
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+    return pool
+
+
+def get_pool(provider, locale=DEFAULT_LOCALE, size=DEFAULT_POOL_SIZE):
+    key = (provider, locale, size)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools.put(key, load_or_build_pool(provider, locale, size))
+    return pool
+
+
+def get_derived_pool(name, provider, transform, locale=DEFAULT_LOCALE, size=DEFAULT_POOL_SIZE):
+    # A pool computed value by value from another provider's pool, e.g. emails from names
+    key = (name, locale, size)
+    pool = _pools.get(key)
+    if pool is None:
+        source = get_pool(provider, locale, size)
+        pool = _pools.put(key, np.array([transform(value) for value in source], dtype=object))
+    return pool
+
+
+def sample_pool(pool, rows, rng):
+    return pool[rng.integers(0, len(pool), size=rows)]
+
+
+def sample(provider, rows, rng, locale=DEFAULT_LOCALE, size=DEFAULT_POOL_SIZE):
+    return sample_pool(get_pool(provider, locale, size), rows, rng)
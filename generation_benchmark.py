@@ -0,0 +1,318 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Benchmarks the generator core: every domain of the Data Generator App and
+# every v5 dtype, at several row counts and table widths. Each case runs in a
+# fresh process so its peak RSS is its own. The headless CLI's startup is
+# timed and reported against its budget too. The exit code is 1 when a case
+# regresses against the baseline, or with --check-startup when the CLI is
+# over its startup budget.
+#
+#   python generation_benchmark.py --output results.json
+#   python generation_benchmark.py --output new.json --baseline results.json --threshold 0.15
+#   python generation_benchmark.py --rows 1000 --check-startup
+
+DOMAINS = ["Retail", "HR", "Supply_Chain"]
+DEFAULT_ROWS = [10_000, 100_000]
+DEFAULT_DTYPE_WIDTHS = [1, 10]
+# Narrow domain tables use this many leading columns; wide ones use all of them
+NARROW_DOMAIN_WIDTH = 5
+BENCHMARK_SEED = 0
+WARMUP_ROWS = 1_000
+# The CLI's import-to-first-row time (the fastest of STARTUP_REPEATS fresh
+# runs) must stay under this, below the 0.3-0.4 s that importing streamlit
+# alone takes, so batch jobs start faster than the app could
+FIRST_ROW_BUDGET_SECONDS = 0.25
+STARTUP_REPEATS = 5
+# A table this small is a single chunk, so only startup is timed
+STARTUP_ROWS = 1_000
+# Memory growth within this many MB of the baseline is never a regression
+# (page-size noise on cases that barely allocate)
+RSS_NOISE_MB = 1.0
+STREAMLIT_IMPORT = "import time; started = time.perf_counter(); import streamlit; print(time.perf_counter() - started)"
+
+
+# ==============================
+# Cases
+# ==============================
+def dtype_columns(dtype, width):
+    # A table of `width` columns of one dtype, plus the columns it needs
+    # (a parent key for foreign keys, operands for expressions)
+    def column(i):
+        name = f"{dtype}_{i}"
+        if dtype in ["number", "float"]:
+            return {"name": name, "dtype": dtype, "min": 0, "max": 1000}
+        if dtype == "contains":
+            return {"name": name, "dtype": dtype, "custom_values": "Red, Green, Blue, Yellow"}
+        if dtype == "custom":
+            return {"name": name, "dtype": dtype, "custom_examples": "Small, Medium, Large"}
+        if dtype == "date":
+            return {"name": name, "dtype": dtype, "start_date": "2020-01-01", "end_date": "2024-12-31"}
+        if dtype == "foreign_key":
+            return {"name": name, "dtype": dtype, "ref_table": "Parent", "ref_column": "Parent_ID"}
+        if dtype == "expression":
+            return {"name": name, "dtype": dtype, "expression": "Quantity * Price"}
+        return {"name": name, "dtype": dtype}
+
+    columns = [column(i) for i in range(width)]
+    if dtype == "expression":
+        columns += [{"name": "Quantity", "dtype": "number", "min": 1, "max": 100},
+                    {"name": "Price", "dtype": "float", "min": 1, "max": 500}]
+    return columns
+
+
+def dtype_table_config(dtype, rows, width):
+    from columnar_engine import link_foreign_keys
+    tables = {
+        "Child": {"name": "Child", "rows": rows, "seed": BENCHMARK_SEED, "columns": dtype_columns(dtype, width)},
+        "Parent": {"name": "Parent", "rows": max(rows // 10, 1), "seed": BENCHMARK_SEED,
+                   "columns": [{"name": "Parent_ID", "dtype": "unique"}]},
+    }
+    return link_foreign_keys(tables)["Child"]
+
+
+def build_cases(rows_list, domains, dtypes, widths):
+    cases = []
+    for rows in rows_list:
+        for domain in domains:
+            for width in ["narrow", "wide"]:
+                cases.append({"name": f"domain:{domain}:{width}:{rows}", "kind": "domain",
+                              "target": domain, "width": width, "rows": rows})
+        for dtype in dtypes:
+            for width in widths:
+                cases.append({"name": f"dtype:{dtype}:{width}:{rows}", "kind": "dtype",
+                              "target": dtype, "width": width, "rows": rows})
+    return cases
+
+
+# ==============================
+# Running a Case
+# ==============================
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def time_domain(case, rows):
+    from column_chunks import chunk_frame
+    from columnar_engine import DEFAULT_CHUNK_SIZE
+    from domain_generators import domain_columns, generate_columns, iter_domain_chunks
+
+    names = list(domain_columns(case["target"]))
+    if case["width"] == "narrow":
+        names = names[:NARROW_DOMAIN_WIDTH]
+    started = time.perf_counter()
+    for _ in iter_domain_chunks(case["target"], rows, names, seed=BENCHMARK_SEED):
+        pass
+    seconds = time.perf_counter() - started
+
+    # Each column on its own, over the same chunks
+    column_seconds = {}
+    for name in names:
+        started = time.perf_counter()
+        for chunk_index, start in enumerate(range(0, rows, DEFAULT_CHUNK_SIZE)):
+            chunk_rows = min(DEFAULT_CHUNK_SIZE, rows - start)
+            chunk_frame(generate_columns(domain_columns(case["target"]), chunk_rows, [name], BENCHMARK_SEED,
+                                         chunk_index=chunk_index, start=start, total_rows=rows))
+        column_seconds[name] = time.perf_counter() - started
+    return seconds, column_seconds
+
+
+def time_dtype(case, rows):
+    from column_chunks import chunk_frame
+    from columnar_engine import DEFAULT_CHUNK_SIZE, compile_table_config
+
+    table_config = dtype_table_config(case["target"], rows, case["width"])
+    started = time.perf_counter()
+    plan = compile_table_config(table_config)
+    column_seconds = {column.name: 0.0 for column in plan.columns}
+    for chunk_index, start in enumerate(range(0, rows, DEFAULT_CHUNK_SIZE)):
+        chunk_rows = min(DEFAULT_CHUNK_SIZE, rows - start)
+        data = {}
+        # Same steps as TablePlan.generate_chunk, timed per column
+        for column in plan.order:
+            column_started = time.perf_counter()
+            data[column.name] = column.generate(chunk_rows, start, BENCHMARK_SEED, chunk_index, data)
+            column_seconds[column.name] += time.perf_counter() - column_started
+        chunk_frame({column.name: data[column.name] for column in plan.columns})
+    return time.perf_counter() - started, column_seconds
+
+
+def run_case(case, repeat=1):
+    # Runs in its own process: warms up (imports, Faker pools) on a small table,
+    # then keeps the fastest of `repeat` runs
+    timer = time_domain if case["kind"] == "domain" else time_dtype
+    timer(case, WARMUP_ROWS)
+    baseline_rss = peak_rss_mb()
+    seconds, column_seconds = min((timer(case, case["rows"]) for _ in range(repeat)), key=lambda result: result[0])
+    return dict(case,
+                seconds=round(seconds, 6),
+                rows_per_sec=round(case["rows"] / seconds, 1) if seconds else None,
+                peak_rss_mb=round(peak_rss_mb(), 1),
+                warm_rss_mb=round(baseline_rss, 1),
+                # What the case itself allocated, above the warmed-up interpreter
+                # (Python, pandas, Faker: about 105 MB)
+                rss_growth_mb=round(peak_rss_mb() - baseline_rss, 1),
+                column_seconds={name: round(value, 6) for name, value in column_seconds.items()})
+
+
+def run_cases(cases, repeat):
+    # One process per case (max_tasks_per_child=1), run one at a time so cases
+    # do not compete for CPU or memory
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with ProcessPoolExecutor(1, mp_context=context, max_tasks_per_child=1) as executor:
+        for case in cases:
+            result = executor.submit(run_case, case, repeat).result()
+            results.append(result)
+            print(f"{result['name']:<42} {result['rows_per_sec']:>14,.0f} rows/s "
+                  f"{result['peak_rss_mb']:>8.1f} MB peak {result['rss_growth_mb']:>8.1f} MB growth", file=sys.stderr)
+    return results
+
+
+# ==============================
+# CLI Startup
+# ==============================
+def time_startup(repeat=STARTUP_REPEATS):
+    # Fresh interpreters running synthetic_data_cli.py --timing; the fastest
+    # run counts. Importing streamlit is timed the same way for comparison.
+    cli = os.path.join(os.path.dirname(os.path.abspath(__file__)), "synthetic_data_cli.py")
+    runs = []
+    streamlit_seconds = []
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(repeat):
+            result = subprocess.run([sys.executable, cli, "--domain", DOMAINS[0], "--rows", str(STARTUP_ROWS),
+                                     "--output", os.path.join(directory, "startup.csv"), "--timing"],
+                                    capture_output=True, text=True, check=True)
+            runs.append(json.loads(result.stderr.strip().splitlines()[-1]))
+            result = subprocess.run([sys.executable, "-c", STREAMLIT_IMPORT], capture_output=True, text=True)
+            if result.returncode == 0:
+                streamlit_seconds.append(float(result.stdout))
+    fastest = min(runs, key=lambda run: run["first_row"])
+    return {
+        "rows": STARTUP_ROWS,
+        "import_seconds": round(fastest["import"], 6),
+        "first_row_seconds": round(fastest["first_row"], 6),
+        "streamlit_import_seconds": round(min(streamlit_seconds), 6) if streamlit_seconds else None,
+    }
+
+
+# ==============================
+# Results and Baselines
+# ==============================
+def environment():
+    import numpy
+    import pandas
+    return {
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def rss_growth_mb(case):
+    return case["peak_rss_mb"] - case["warm_rss_mb"]
+
+
+def compare_results(results, baseline, threshold):
+    # A case regresses when its rows/sec drops, or the memory it allocates
+    # (peak RSS minus the warmed-up RSS) grows, by more than `threshold` (a
+    # fraction) relative to the baseline. Absolute peak RSS is mostly the
+    # interpreter and would hide growth of up to threshold * ~105 MB.
+    baseline_cases = {case["name"]: case for case in baseline["cases"]}
+    regressions = []
+    for case in results["cases"]:
+        old = baseline_cases.get(case["name"])
+        if old is None:
+            continue
+        if old["rows_per_sec"] and case["rows_per_sec"] < old["rows_per_sec"] * (1 - threshold):
+            regressions.append(f"{case['name']}: {case['rows_per_sec']:,.0f} rows/s, "
+                               f"baseline {old['rows_per_sec']:,.0f} rows/s")
+        growth, old_growth = rss_growth_mb(case), rss_growth_mb(old)
+        if growth > old_growth * (1 + threshold) + RSS_NOISE_MB:
+            regressions.append(f"{case['name']}: {growth:.1f} MB RSS growth, baseline {old_growth:.1f} MB")
+    return regressions
+
+
+def parse_args(argv=None):
+    from columnar_engine import COLUMN_TYPES
+    dtypes = list(COLUMN_TYPES)
+    parser = argparse.ArgumentParser(description="Benchmark synthetic data generation speed and memory.")
+    parser.add_argument("--rows", default=",".join(map(str, DEFAULT_ROWS)),
+                        help="Comma-separated row counts (default: %(default)s)")
+    parser.add_argument("--widths", default=",".join(map(str, DEFAULT_DTYPE_WIDTHS)),
+                        help="Comma-separated column counts for the dtype tables (default: %(default)s)")
+    parser.add_argument("--domains", default=",".join(DOMAINS), help="Comma-separated domains (default: all)")
+    parser.add_argument("--dtypes", default=",".join(dtypes), help="Comma-separated v5 dtypes (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the fastest is kept")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed slowdown / memory growth against the baseline (default: %(default)s)")
+    parser.add_argument("--first-row-budget", type=float, default=FIRST_ROW_BUDGET_SECONDS,
+                        help="Allowed CLI import-to-first-row seconds (default: %(default)s)")
+    parser.add_argument("--check-startup", action="store_true",
+                        help="Also fail when the CLI's first row is over --first-row-budget")
+    args = parser.parse_args(argv)
+    args.rows = [int(value) for value in args.rows.split(",") if value]
+    args.widths = [int(value) for value in args.widths.split(",") if value]
+    args.domains = [value for value in args.domains.split(",") if value]
+    args.dtypes = [value for value in args.dtypes.split(",") if value]
+    unknown = [value for value in args.domains if value not in DOMAINS] + \
+              [value for value in args.dtypes if value not in dtypes]
+    if unknown:
+        parser.error(f"unknown domains/dtypes: {', '.join(unknown)}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = build_cases(args.rows, args.domains, args.dtypes, args.widths)
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment(),
+        "cases": run_cases(cases, args.repeat),
+        "startup": time_startup(),
+    }
+    startup = results["startup"]
+    print(f"{'startup:cli':<42} {startup['first_row_seconds']:>12.3f} s to first row "
+          f"(streamlit import {startup['streamlit_import_seconds'] or float('nan'):.3f} s)", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    # The startup budget is reported on its own; it only fails the run when
+    # asked for, so a slow machine does not fail every baseline comparison
+    failed = False
+    if startup["first_row_seconds"] > args.first_row_budget:
+        print(f"OVER BUDGET CLI first row after {startup['first_row_seconds']:.3f} s, "
+              f"budget {args.first_row_budget:.3f} s", file=sys.stderr)
+        failed = args.check_startup
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare_results(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            failed = True
+        else:
+            print(f"No regressions against {args.baseline} (threshold {args.threshold:.0%})", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import pandas as pd
+from columnar_engine import DEFAULT_CHUNK_SIZE, column_dependencies
+from exporters import DownloadFile
+from memory_lru import MemoryLRU
+
+# Generated datasets are kept per server process, so every Streamlit session
+# and every rerun with unchanged inputs reuses them
+DATASET_CACHE_MEMORY_LIMIT = 512 * 1024 * 1024
+COLUMN_CACHE_MEMORY_LIMIT = 512 * 1024 * 1024
+# Exports are kept as temporary files; this bounds their total size on disk
+EXPORT_CACHE_DISK_LIMIT = 4 * 1024 * 1024 * 1024
+
+
+def dataset_nbytes(value):
+    total = 0
+    for item in value:
+        if hasattr(item, "memory_usage"):
+            total += int(item.memory_usage(deep=True).sum())
+        else:
+            total += sys.getsizeof(item)
+    return total
+
+
+def series_nbytes(series):
+    return int(series.memory_usage(deep=True))
+
+
+def remove_file(path):
+    # A session still reading an evicted export keeps its open handle
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_datasets = MemoryLRU(DATASET_CACHE_MEMORY_LIMIT, dataset_nbytes)
+_columns = MemoryLRU(COLUMN_CACHE_MEMORY_LIMIT, series_nbytes)
+_exports = MemoryLRU(EXPORT_CACHE_DISK_LIMIT, os.path.getsize, remove_file)
+
+
+def set_dataset_cache_memory_limit(max_bytes):
+    _datasets.set_max_bytes(max_bytes)
+
+
+def set_column_cache_memory_limit(max_bytes):
+    _columns.set_max_bytes(max_bytes)
+
+
+def set_export_cache_disk_limit(max_bytes):
+    _exports.set_max_bytes(max_bytes)
+
+
+def dataset_key(domain, nrows, columns, seed, export_format=None):
+    # Column order is part of the key because it is the order of the output;
+    # export_format is None for values that do not depend on it (the preview)
+    return (domain, int(nrows), tuple(columns or ()), int(seed), export_format)
+
+
+def cached_dataset(key, build):
+    # build() returns a tuple of DataFrames/bytes and only runs on a cache miss
+    value = _datasets.get(key)
+    if value is None:
+        value = _datasets.put(key, build())
+    return value
+
+
+def cached_export(key, write):
+    # write(file) writes the export into a binary file and only runs on a cache
+    # miss. Returns the export as a DownloadFile, which closes itself once the
+    # download has read it; the file itself stays on disk until it is evicted.
+    # Opened before it is cached, so an export over the disk limit (evicted at
+    # once) can still be downloaded this time.
+    path = _exports.get(key)
+    if path is not None:
+        try:
+            return DownloadFile(path)
+        except FileNotFoundError:
+            pass  # evicted by another session since get()
+    fd, path = tempfile.mkstemp(prefix="export-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            write(file)
+    except BaseException:
+        # Also on Streamlit's rerun/stop exceptions, so failed exports never pile up on disk
+        os.remove(path)
+        raise
+    export = DownloadFile(path)
+    _exports.put(key, path)
+    return export
+
+
+# ==============================
+# Column-level Cache (v5 tables)
+# ==============================
+def column_key(col, rows, seed, chunk_size):
+    # A column's values depend only on its own config, the row count, the seed
+    # and the chunk size (see columnar_engine.ColumnGenerator)
+    config = json.dumps(col, sort_keys=True, default=str)
+    return (hashlib.sha1(config.encode()).hexdigest(), int(rows), int(seed), chunk_size)
+
+
+def cached_table_columns(table_config, seed, generate, chunk_size=DEFAULT_CHUNK_SIZE):
+    # generate(table_config) builds a DataFrame; it is only called with the
+    # columns whose config changed since they were last generated
+    if seed is None:
+        return generate(table_config)
+    rows = table_config["rows"]
+    columns = table_config["columns"]
+    # An expression column's values also depend on the columns it uses
+    dependencies = column_dependencies(columns)
+    by_name = {col["name"]: col for col in columns}
+    keys = {}
+    for col in columns:
+        used = sorted(dependencies.get(col["name"], ()))
+        config = dict(col, depends_on=[by_name[name] for name in used]) if used else col
+        keys[col["name"]] = column_key(config, rows, seed, chunk_size)
+
+    values = {}
+    missing = set()
+    for col in columns:
+        series = _columns.get(keys[col["name"]])
+        if series is None:
+            missing.add(col["name"])
+            missing |= dependencies.get(col["name"], set())
+        else:
+            values[keys[col["name"]]] = series
+    if missing:
+        missing_df = generate(dict(table_config, columns=[col for col in columns if col["name"] in missing]))
+        for name in missing:
+            if name in missing_df:
+                values[keys[name]] = _columns.put(keys[name], missing_df[name])
+    data = {}
+    for col in columns:
+        key = keys[col["name"]]
+        if key in values:
+            data[col["name"]] = values[key].rename(col["name"])
+    return pd.DataFrame(data, index=pd.RangeIndex(rows))
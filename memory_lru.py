@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+
+
+class MemoryLRU:
+    # Least-recently-used cache bounded by the total size of its values.
+    # `sizeof` returns the size of one value in bytes; `on_evict`, if given, is
+    # called with every value that leaves the cache or is too large to keep.
+    # Streamlit runs every session in its own thread, so all access goes
+    # through one lock.
+
+    def __init__(self, max_bytes, sizeof, on_evict=None):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        self.total_bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key][0]
+
+    def put(self, key, value):
+        # Returns value; values larger than the whole budget are not kept
+        nbytes = self.sizeof(value)
+        with self._lock:
+            if key in self._items:
+                old_value, old_nbytes = self._items.pop(key)
+                self.total_bytes -= old_nbytes
+                self._evicted(old_value)
+            if nbytes > self.max_bytes:
+                self._evicted(value)
+                return value
+            self._items[key] = (value, nbytes)
+            self.total_bytes += nbytes
+            self._evict()
+        return value
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            for value, _ in self._items.values():
+                self._evicted(value)
+            self._items.clear()
+            self.total_bytes = 0
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._items:
+            _, (value, nbytes) = self._items.popitem(last=False)
+            self.total_bytes -= nbytes
+            self._evicted(value)
+
+    def _evicted(self, value):
+        if self.on_evict is not None:
+            self.on_evict(value)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
@@ -0,0 +1,92 @@
+import os
+from collections import deque
+import numpy as np
+from column_chunks import chunk_frame
+from columnar_engine import DEFAULT_CHUNK_SIZE, compile_table_config, generate_table_chunk
+from domain_generators import domain_columns, generate_columns
+from faker_pools import DEFAULT_LOCALE
+
+# Chunks queued per worker; bounds how many finished chunks wait in memory
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def root_seed(seed):
+    # Without a user seed, draw one root seed here so every worker still
+    # derives its chunk streams from the same SeedSequence
+    return np.random.SeedSequence().entropy if seed is None else seed
+
+
+def chunk_ranges(rows, chunk_size):
+    # Chunk boundaries depend only on chunk_size, never on the worker count,
+    # so chunk i always covers the same rows with the same seeded streams
+    return [(chunk_index, start, min(start + chunk_size, rows))
+            for chunk_index, start in enumerate(range(0, rows, chunk_size))]
+
+
+# With frames=False the chunks stay dicts of columns (see column_chunks.py),
+# which write_csv writes without importing pandas. Either way the chunk is
+# built in the worker.
+def _table_chunk(task):
+    plan, seed, chunk_index, start, stop, frames = task
+    chunk = plan.generate_columns(start, stop, seed, chunk_index)
+    return chunk_frame(chunk) if frames else chunk
+
+
+def _domain_chunk(task):
+    choose_domain, columns, seed, locale, nrows, chunk_index, start, stop, frames = task
+    chunk = generate_columns(domain_columns(choose_domain), stop - start, columns, seed, locale,
+                             chunk_index, start, nrows)
+    return chunk_frame(chunk) if frames else chunk
+
+
+def iter_ordered_results(function, tasks, workers):
+    # Runs tasks on a process pool and yields results in task order, keeping at
+    # most CHUNKS_IN_FLIGHT_PER_WORKER * workers chunks submitted at once
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield function(task)
+        return
+    # Imported here: single-worker runs (the CLI default) never start a pool
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    # "spawn" instead of fork: Streamlit runs scripts in threads, which fork does not copy safely
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = deque()
+        tasks = iter(tasks)
+        for task in tasks:
+            pending.append(pool.submit(function, task))
+            if len(pending) >= workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_parallel_table_chunks(table_config, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, frames=True):
+    seed = root_seed(seed)
+    # Workers get the compiled plan, not the config (which may hold a DataFrame)
+    plan = compile_table_config(table_config)
+    tasks = [(plan, seed, chunk_index, start, stop, frames)
+             for chunk_index, start, stop in chunk_ranges(table_config["rows"], chunk_size)]
+    return iter_ordered_results(_table_chunk, tasks, workers or default_workers())
+
+
+def iter_parallel_domain_chunks(choose_domain, nrows, columns=None, seed=None, locale=DEFAULT_LOCALE,
+                                chunk_size=DEFAULT_CHUNK_SIZE, workers=None, frames=True):
+    seed = root_seed(seed)
+    columns = list(columns) if columns else None
+    tasks = [(choose_domain, columns, seed, locale, nrows, chunk_index, start, stop, frames)
+             for chunk_index, start, stop in chunk_ranges(nrows, chunk_size)]
+    return iter_ordered_results(_domain_chunk, tasks, workers or default_workers())
+
+
+def generate_parallel_synthetic_data(table_config, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    import pandas as pd
+    chunks = list(iter_parallel_table_chunks(table_config, seed, chunk_size, workers))
+    if not chunks:
+        return generate_table_chunk(table_config, 0, 0, seed)
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
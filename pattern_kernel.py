@@ -0,0 +1,93 @@
+import math
+import string
+from functools import lru_cache
+import numpy as np
+
+# Same character sets Faker uses for numerify/bothify placeholders
+DIGIT_PLACEHOLDERS = {
+    "#": "0123456789",  # random digit
+    "%": "123456789",   # random non-zero digit
+    "$": "23456789",    # random digit above two
+}
+LETTER_PLACEHOLDER = "?"
+
+
+class CompiledPattern:
+    # A numerify/bothify template parsed once into fixed character slots.
+    # generate() fills every slot for N rows with one NumPy call per alphabet.
+
+    def __init__(self, text, letters=None):
+        if "!" in text or "@" in text:
+            raise ValueError(f"Pattern '{text}': '!' and '@' give variable-length output and are not supported.")
+        try:
+            self.template = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        except UnicodeEncodeError:
+            raise ValueError(f"Pattern '{text}' must only contain ASCII characters.")
+        self.text = text
+        self.width = len(text)
+
+        alphabets = dict(DIGIT_PLACEHOLDERS)
+        if letters is not None:
+            alphabets[LETTER_PLACEHOLDER] = letters
+        # (positions, alphabet) for every placeholder type present in the template
+        self.slots = []
+        for placeholder, alphabet in alphabets.items():
+            positions = np.flatnonzero(self.template == ord(placeholder))
+            if len(positions):
+                self.slots.append((positions, np.frombuffer(alphabet.encode("ascii"), dtype=np.uint8)))
+
+    @property
+    def capacity(self):
+        # Number of distinct strings the template can produce
+        return math.prod(len(alphabet) ** len(positions) for positions, alphabet in self.slots)
+
+    def generate(self, size, rng):
+        chars = self._template_rows(size)
+        for positions, alphabet in self.slots:
+            chars[:, positions] = alphabet[rng.integers(0, len(alphabet), size=(size, len(positions)))]
+        return self._strings(chars)
+
+    def format(self, values):
+        # Writes each value in [0, capacity) into the placeholders as a
+        # mixed-radix number, so distinct values give distinct strings
+        values = np.array(values, dtype=np.uint64)
+        chars = self._template_rows(len(values))
+        for positions, alphabet in self.slots:
+            radix = np.uint64(len(alphabet))
+            for position in positions[::-1]:
+                chars[:, position] = alphabet[values % radix]
+                values //= radix
+        return self._strings(chars)
+
+    def _template_rows(self, size):
+        chars = np.empty((size, self.width), dtype=np.uint8)
+        chars[:] = self.template
+        return chars
+
+    def _strings(self, chars):
+        if self.width == 0:
+            return np.full(len(chars), "", dtype=object)
+        return chars.view(f"S{self.width}").ravel().astype(f"U{self.width}").astype(object)
+
+
+@lru_cache(maxsize=256)
+def compile_pattern(text, letters=None):
+    return CompiledPattern(text, letters)
+
+
+def numerify(text, size, rng):
+    return compile_pattern(text).generate(size, rng)
+
+
+def bothify(text, size, rng, letters=string.ascii_letters):
+    return compile_pattern(text, letters).generate(size, rng)
+
+
+def bothify_choice(texts, size, rng, letters=string.ascii_letters):
+    # Each row picks one of several templates, like bothify(random.choice(texts))
+    values = np.empty(size, dtype=object)
+    codes = rng.integers(0, len(texts), size=size)
+    for code, text in enumerate(texts):
+        mask = codes == code
+        values[mask] = bothify(text, int(mask.sum()), rng, letters)
+    return values
@@ -0,0 +1,120 @@
+import time
+
+# Taken before any other import, so --timing covers the full import cost
+START_TIME = time.perf_counter()
+
+import argparse
+import json
+import os
+import sys
+
+# generation_benchmark.py fails when the --timing import-to-first-row time is
+# over its FIRST_ROW_BUDGET_SECONDS
+DOMAINS = ["Retail", "HR", "Supply_Chain"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic data without Streamlit, from a domain or a saved table_config.json.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--domain", choices=DOMAINS, help="Domain to generate (Data Generator App)")
+    source.add_argument("--config", help="table_config.json saved from the multi-table builder")
+    parser.add_argument("--rows", type=int, help="Row count (required with --domain; overrides the config)")
+    parser.add_argument("--columns", help="Comma-separated domain columns to generate (default: all)")
+    parser.add_argument("--output", required=True,
+                        help="Output file (.csv/.parquet/.arrow), or .zip / directory when the config has several tables")
+    parser.add_argument("--format", choices=["CSV", "Parquet", "Arrow IPC"],
+                        help="File format (default: from the --output extension, else CSV)")
+    parser.add_argument("--seed", type=int, help="Seed (default: the table's saved seed, else random)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1)")
+    parser.add_argument("--chunk-size", type=int, help="Rows generated and written per chunk")
+    parser.add_argument("--timing", action="store_true",
+                        help="Print import, first-row and total seconds to stderr as JSON")
+    args = parser.parse_args(argv)
+    if args.domain and not args.rows:
+        parser.error("--rows is required with --domain")
+    return args
+
+
+def load_table_configs(path, rows=None):
+    with open(path, encoding="utf-8") as file:
+        tables = json.load(file)
+    for table_config in tables.values():
+        if rows:
+            table_config["rows"] = rows
+    return tables
+
+
+def output_format(args, export_formats):
+    if args.format:
+        return args.format
+    for name, (_, extension, _) in export_formats.items():
+        if args.output.endswith(extension):
+            return name
+    return "CSV"
+
+
+def timed_chunks(chunks, timings):
+    # Records when the first chunk (and so the first row) is ready
+    for chunk in chunks:
+        timings.setdefault("first_row", time.perf_counter() - START_TIME)
+        yield chunk
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Imported here so that --timing measures the generator core's import cost
+    from columnar_engine import DEFAULT_CHUNK_SIZE, compile_table_config, link_foreign_keys
+    from domain_generators import domain_columns
+    from exporters import EXPORT_FORMATS, write_zip
+    from parallel_generation import iter_parallel_domain_chunks, iter_parallel_table_chunks, root_seed
+    timings = {"import": time.perf_counter() - START_TIME}
+    chunk_size = args.chunk_size or DEFAULT_CHUNK_SIZE
+    export_format = output_format(args, EXPORT_FORMATS)
+    writer, extension, _ = EXPORT_FORMATS[export_format]
+    # CSV is written from dicts of columns, so pandas is never imported for it
+    # (unless a nullable or text expression column needs it)
+    frames = export_format != "CSV"
+
+    if args.domain:
+        columns = [name.strip() for name in args.columns.split(",")] if args.columns else None
+        unknown = [name for name in columns or [] if name not in domain_columns(args.domain)]
+        if unknown:
+            sys.exit(f"Unknown columns for domain '{args.domain}': {', '.join(unknown)}")
+        tables = {f"{args.domain}{extension}": iter_parallel_domain_chunks(
+            args.domain, args.rows, columns, seed=args.seed, chunk_size=chunk_size, workers=args.workers,
+            frames=frames)}
+    else:
+        table_configs = load_table_configs(args.config, args.rows)
+        # Seeds are fixed before linking, since foreign keys are computed from their parent's seed
+        for table_config in table_configs.values():
+            table_config["seed"] = root_seed(args.seed if args.seed is not None else table_config.get("seed"))
+        tables = {}
+        for table_name, table_config in link_foreign_keys(table_configs).items():
+            try:
+                compile_table_config(table_config)
+            except ValueError as error:
+                sys.exit(f"Error in table '{table_config.get('name', table_name)}': {error}")
+            tables[f"{table_config.get('name', table_name)}{extension}"] = iter_parallel_table_chunks(
+                table_config, table_config["seed"], chunk_size=chunk_size, workers=args.workers, frames=frames)
+
+    tables = {file_name: timed_chunks(chunks, timings) for file_name, chunks in tables.items()}
+    if args.output.endswith(".zip"):
+        with open(args.output, "wb") as file:
+            write_zip(tables, file, writer)
+    elif len(tables) == 1:
+        with open(args.output, "wb") as file:
+            writer(next(iter(tables.values())), file)
+    else:
+        os.makedirs(args.output, exist_ok=True)
+        for file_name, chunks in tables.items():
+            with open(os.path.join(args.output, file_name), "wb") as file:
+                writer(chunks, file)
+
+    if args.timing:
+        timings["total"] = time.perf_counter() - START_TIME
+        print(json.dumps({name: round(value, 6) for name, value in timings.items()}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import io
+import tempfile
+import unittest
+import zipfile
+import pandas as pd
+from exporters import ZIP64_LIMIT, iter_frame_chunks, write_csv, write_zip
+
+# Round-trips write_zip archives through zipfile, including ZIP64 archives
+# with a member and header offsets past 4 GiB (about a minute to run)
+
+BLOCK_SIZE = 64 * 1024 * 1024
+
+
+def write_bytes(chunks, file):
+    for chunk in chunks:
+        file.write(chunk)
+
+
+def zero_blocks(size):
+    block = bytes(BLOCK_SIZE)
+    for start in range(0, size, BLOCK_SIZE):
+        yield block[:min(BLOCK_SIZE, size - start)]
+
+
+class WriteZipTest(unittest.TestCase):
+    def test_csv_tables(self):
+        frames = {f"table_{i}.csv": pd.DataFrame({"id": range(i * 1000), "name": [f"row {n}" for n in range(i * 1000)]})
+                  for i in range(1, 5)}
+        file = io.BytesIO()
+        write_zip({name: iter_frame_chunks(df, 300) for name, df in frames.items()}, file, write_csv, workers=2)
+        with zipfile.ZipFile(file) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.namelist(), list(frames))
+            for name, df in frames.items():
+                with archive.open(name) as member:
+                    pd.testing.assert_frame_equal(pd.read_csv(member), df, check_dtype=False)
+
+    def test_empty_and_unicode_members(self):
+        file = io.BytesIO()
+        write_zip({"empty.bin": [], "données_表.bin": [b"abc" * 1000]}, file, write_bytes)
+        with zipfile.ZipFile(file) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.read("empty.bin"), b"")
+            self.assertEqual(archive.read("données_表.bin"), b"abc" * 1000)
+
+    def test_zip64_member_and_offsets(self):
+        # A member over 4 GiB uncompressed, and an archive starting 5 GiB into
+        # a sparse file so every local header offset needs ZIP64 too
+        size = ZIP64_LIMIT + BLOCK_SIZE
+        with tempfile.TemporaryFile() as file:
+            file.seek(5 * 1024 ** 3)
+            write_zip({"small.bin": [b"hello"], "large.bin": zero_blocks(size)}, file, write_bytes)
+            file.seek(0)
+            with zipfile.ZipFile(file) as archive:
+                small, large = archive.infolist()
+                self.assertGreater(small.header_offset, ZIP64_LIMIT)
+                self.assertGreater(large.header_offset, ZIP64_LIMIT)
+                self.assertEqual(large.file_size, size)
+                self.assertEqual(archive.read("small.bin"), b"hello")
+                self.assertIsNone(archive.testzip())
+
+    def test_zip64_entry_count(self):
+        tables = {f"{i}.txt": [str(i).encode()] for i in range(0xFFFF + 10)}
+        file = io.BytesIO()
+        write_zip(tables, file, write_bytes)
+        with zipfile.ZipFile(file) as archive:
+            self.assertEqual(len(archive.infolist()), len(tables))
+            self.assertEqual(archive.read("65540.txt"), b"65540")
+            self.assertIsNone(archive.testzip())
+
+
+if __name__ == "__main__":
+    unittest.main()
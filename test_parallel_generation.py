@@ -0,0 +1,70 @@
+import io
+import unittest
+import pandas as pd
+from columnar_engine import link_foreign_keys
+from exporters import write_csv
+from parallel_generation import iter_parallel_domain_chunks, iter_parallel_table_chunks
+
+# A seed gives the same table whatever the number of worker processes (each
+# run with workers=2 starts a small process pool)
+
+ROWS = 2500
+CHUNK_SIZE = 600
+
+
+def table_config():
+    return link_foreign_keys({
+        "Orders": {"name": "Orders", "rows": ROWS, "seed": 11, "columns": [
+            {"name": "index", "dtype": "index"},
+            {"name": "Customer", "dtype": "name", "nullable": True, "null_percentage": 10},
+            {"name": "Quantity", "dtype": "number", "min": 1, "max": 20},
+            {"name": "Price", "dtype": "float", "min": 1, "max": 100},
+            {"name": "Color", "dtype": "contains", "custom_values": "Red, Green, Blue"},
+            {"name": "Ordered", "dtype": "date", "start_date": "2023-01-01", "end_date": "2023-12-31"},
+            {"name": "Order_ID", "dtype": "unique", "template": "ORD######"},
+            {"name": "Store", "dtype": "foreign_key", "ref_table": "Stores", "ref_column": "Store_ID"},
+            {"name": "Total", "dtype": "expression", "expression": "Quantity * Price"}]},
+        "Stores": {"name": "Stores", "rows": 40, "seed": 12, "columns": [{"name": "Store_ID", "dtype": "unique"}]},
+    })["Orders"]
+
+
+def concat(chunks):
+    return pd.concat(list(chunks), ignore_index=True)
+
+
+def csv_bytes(chunks):
+    file = io.BytesIO()
+    write_csv(chunks, file)
+    return file.getvalue()
+
+
+class WorkerCountTest(unittest.TestCase):
+    def test_table_chunks(self):
+        config = table_config()
+        one = concat(iter_parallel_table_chunks(config, 11, chunk_size=CHUNK_SIZE, workers=1))
+        two = concat(iter_parallel_table_chunks(config, 11, chunk_size=CHUNK_SIZE, workers=2))
+        self.assertEqual(len(one), ROWS)
+        pd.testing.assert_frame_equal(one, two)
+
+    def test_domain_chunks(self):
+        for domain in ["Retail", "HR", "Supply_Chain"]:
+            with self.subTest(domain=domain):
+                one = concat(iter_parallel_domain_chunks(domain, ROWS, seed=5, chunk_size=CHUNK_SIZE, workers=1))
+                two = concat(iter_parallel_domain_chunks(domain, ROWS, seed=5, chunk_size=CHUNK_SIZE, workers=2))
+                pd.testing.assert_frame_equal(one, two)
+
+    def test_csv_from_column_chunks(self):
+        # The CLI writes CSV from dicts of columns, with the csv module unless a
+        # column needs pandas (Customer is nullable); it matches the DataFrames' CSV
+        config = table_config()
+        frames = csv_bytes(iter_parallel_table_chunks(config, 11, chunk_size=CHUNK_SIZE, workers=1))
+        columns = csv_bytes(iter_parallel_table_chunks(config, 11, chunk_size=CHUNK_SIZE, workers=2, frames=False))
+        self.assertEqual(columns, frames)
+        frames = csv_bytes(iter_parallel_domain_chunks("Retail", ROWS, seed=5, chunk_size=CHUNK_SIZE, workers=1))
+        columns = csv_bytes(iter_parallel_domain_chunks("Retail", ROWS, seed=5, chunk_size=CHUNK_SIZE, workers=2,
+                                                        frames=False))
+        self.assertEqual(columns, frames)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+import pandas as pd
+from columnar_engine import compile_table_config, generate_synthetic_data, link_foreign_keys
+from domain_generators import iter_domain_chunks
+from unique_keys import key_permutation, unique_numbers, unique_template_keys
+
+# Keys never repeat within a table, whatever the chunking, and a template
+# too small for the row count is refused
+
+
+def key_table(rows, template):
+    return {"rows": rows, "columns": [{"name": "index", "dtype": "index"},
+                                      {"name": "key", "dtype": "unique", "template": template}]}
+
+
+class KeyPermutationTest(unittest.TestCase):
+    def test_permutation_is_a_bijection(self):
+        for size in [1, 2, 3, 100, 1000, 4097]:
+            values = key_permutation(size, 7, 0)(np.arange(size, dtype=np.uint64))
+            self.assertEqual(sorted(values.tolist()), list(range(size)))
+
+    def test_unique_numbers_across_chunks(self):
+        numbers = np.concatenate([unique_numbers(start, min(start + 300, 1000), 1000, 3)
+                                  for start in range(0, 1000, 300)])
+        self.assertEqual(sorted(numbers.tolist()), list(range(1, 1001)))
+
+    def test_template_keys_fill_the_template(self):
+        keys = unique_template_keys("?#", 0, 520, 5)
+        self.assertEqual(len(set(keys)), 520)
+        self.assertRaises(ValueError, unique_template_keys, "?#", 0, 521, 5)
+
+
+class UniqueColumnTest(unittest.TestCase):
+    def test_keys_are_unique_at_full_capacity(self):
+        df = generate_synthetic_data(key_table(1000, "###"), seed=1, chunk_size=64)
+        self.assertEqual(df["key"].nunique(), 1000)
+        self.assertTrue(df["key"].str.fullmatch(r"\d{3}").all())
+
+    def test_template_too_small_for_rows(self):
+        with self.assertRaises(ValueError) as error:
+            compile_table_config(key_table(1001, "###"))
+        self.assertIn("1000 unique keys", str(error.exception))
+
+    def test_chunk_boundaries(self):
+        # The index continues across chunks and keys do not depend on the chunking
+        whole = generate_synthetic_data(key_table(5000, "??####"), seed=2, chunk_size=5000)
+        chunked = generate_synthetic_data(key_table(5000, "??####"), seed=2, chunk_size=777)
+        self.assertEqual(chunked["index"].tolist(), list(range(1, 5001)))
+        pd.testing.assert_series_equal(chunked["key"], whole["key"])
+        self.assertEqual(chunked["key"].nunique(), 5000)
+
+    def test_foreign_keys_reference_parent_keys(self):
+        tables = link_foreign_keys({
+            "Parent": {"name": "Parent", "rows": 50, "seed": 4, "columns": [{"name": "id", "dtype": "unique"}]},
+            "Child": {"name": "Child", "rows": 2000, "seed": 5, "columns": [
+                {"name": "parent_id", "dtype": "foreign_key", "ref_table": "Parent", "ref_column": "id"}]},
+        })
+        parent = generate_synthetic_data(tables["Parent"], seed=4)
+        child = generate_synthetic_data(tables["Child"], seed=5, chunk_size=300)
+        self.assertTrue(child["parent_id"].isin(parent["id"]).all())
+
+
+class DomainKeyTest(unittest.TestCase):
+    def test_domain_keys_across_chunks(self):
+        chunks = list(iter_domain_chunks("HR", 2500, ["EmployeeID"], seed=6, chunk_size=1000))
+        ids = pd.concat(chunks, ignore_index=True)["EmployeeID"]
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(sorted(ids), sorted(f"EMP{n}" for n in range(1, 2501)))
+
+
+if __name__ == "__main__":
+    unittest.main()
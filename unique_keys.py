@@ -0,0 +1,91 @@
+import string
+import numpy as np
+from pattern_kernel import compile_pattern
+
+FEISTEL_ROUNDS = 4
+# Largest permutation domain; templates with more combinations only use this many
+MAX_KEY_SPACE = 2 ** 62
+
+
+def _round_function(values, key):
+    # splitmix64 finalizer of (value + key); uint64 arithmetic wraps around
+    z = (values + key) * np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+class FeistelPermutation:
+    # Keyed bijection of [0, size). A balanced Feistel network permutes the
+    # smallest power of four >= size; values that land outside the range are
+    # run through it again (cycle walking), which keeps the mapping a bijection.
+    # Nothing but the round keys is stored, whatever the size.
+
+    def __init__(self, size, keys):
+        self.size = int(size)
+        half_bits = max(1, ((self.size - 1).bit_length() + 1) // 2)
+        self.half_bits = np.uint64(half_bits)
+        self.half_mask = np.uint64((1 << half_bits) - 1)
+        self.keys = np.asarray(keys, dtype=np.uint64)
+
+    def _encrypt(self, values):
+        left = values >> self.half_bits
+        right = values & self.half_mask
+        for key in self.keys:
+            left, right = right, left ^ (_round_function(right, key) & self.half_mask)
+        return (left << self.half_bits) | right
+
+    def __call__(self, indexes):
+        values = self._encrypt(np.asarray(indexes, dtype=np.uint64))
+        outside = np.flatnonzero(values >= self.size)
+        while len(outside):
+            values[outside] = self._encrypt(values[outside])
+            outside = outside[values[outside] >= self.size]
+        return values
+
+
+def key_permutation(size, seed, stream):
+    # The round keys depend only on the table seed and the column, never on the
+    # chunk, so every chunk of a table applies the same permutation
+    keys = np.random.SeedSequence(seed, spawn_key=(stream,)).generate_state(FEISTEL_ROUNDS, np.uint64)
+    return FeistelPermutation(size, keys)
+
+
+def check_key_capacity(template, rows, letters=string.ascii_letters):
+    capacity = compile_pattern(template, letters).capacity
+    if rows > capacity:
+        raise ValueError(f"Template '{template}' only has {capacity} unique keys, fewer than {rows} rows.")
+
+
+def template_keys(template, indexes, seed, stream=0, letters=string.ascii_letters):
+    # Key of each given row: the template (bothify placeholders) filled with
+    # the row's value under a keyed permutation of all the template's
+    # combinations. Any row's key can be computed on its own.
+    pattern = compile_pattern(template, letters)
+    permutation = key_permutation(min(pattern.capacity, MAX_KEY_SPACE), seed, stream)
+    return pattern.format(permutation(indexes))
+
+
+def unique_template_keys(template, start, stop, seed, stream=0, letters=string.ascii_letters):
+    # Rows start..stop of a key column
+    check_key_capacity(template, stop, letters)
+    return template_keys(template, np.arange(start, stop, dtype=np.uint64), seed, stream, letters)
+
+
+def skewed_indexes(rng, size, count, skew):
+    # Draws from [0, count) with a bounded power law (Zipf-like) over ranks:
+    # rank r is picked with weight about r ** -skew, via the inverse CDF of the
+    # continuous distribution on [1, count + 1)
+    uniform = rng.random(size)
+    if skew == 1:
+        ranks = (count + 1.0) ** uniform
+    else:
+        ranks = ((count + 1.0) ** (1 - skew) - 1) * uniform + 1
+        ranks = ranks ** (1 / (1 - skew))
+    return np.minimum(ranks.astype(np.int64) - 1, count - 1)
+
+
+def unique_numbers(start, stop, total_rows, seed, stream=0):
+    # Rows start..stop of a shuffled 1..total_rows sequence
+    permutation = key_permutation(total_rows, seed, stream)
+    return permutation(np.arange(start, stop, dtype=np.uint64)).astype(np.int64) + 1